@@ -1,26 +1,40 @@
+import concurrent.futures
+import functools
+import itertools
 import os
+import sys
 import time
+import ffmpeg
+import numpy as np
 import psutil
-import pysrt
 import threading
-import statistics
+from collections import deque
 from pathlib import Path
-from typing import Dict, List
-from moviepy.editor import VideoFileClip, TextClip, CompositeVideoClip, VideoClip
-from beautiful_captions import subtitles_from_srt, CaptionConfig, StyleConfig, AnimationConfig
+from typing import Deque, Dict, Tuple
+from moviepy.editor import VideoFileClip, ImageClip, CompositeVideoClip, VideoClip
+from PIL import Image, ImageDraw, ImageFont
+from beautiful_captions import subtitles_from_srt, CaptionConfig, StyleConfig, AnimationConfig, FontManager
+from beautiful_captions.utils.ffmpeg import VAAPI_DEVICE, _detect_hw_encoder
 
 class ResourceMonitor:
-    def __init__(self, interval: float = 0.1):
-        self.interval = interval
-        self.cpu_percentages: List[float] = []
-        self.memory_usages: List[float] = []
+    """
+    Samples CPU and memory in short bursts separated by longer idle periods,
+    so the monitor thread wakes (and takes the GIL) far less often than a fixed 100ms poll.
+    """
+    def __init__(self, sample_burst: int = 5, burst_interval_ms: float = 10,
+                 sampling_interval_s: float = 1.0):
+        self.sample_burst = sample_burst
+        self.burst_interval_ms = burst_interval_ms
+        self.sampling_interval_s = sampling_interval_s
+        self.cpu_percentages: Deque[float] = deque()
+        self.memory_usages: Deque[float] = deque()
         self.is_running = False
         self.process = psutil.Process()
         
     def start(self):
         self.is_running = True
-        self.cpu_percentages = []
-        self.memory_usages = []
+        self.cpu_percentages = deque()
+        self.memory_usages = deque()
         self.monitor_thread = threading.Thread(target=self._monitor)
         self.monitor_thread.start()
         
@@ -29,19 +43,29 @@ class ResourceMonitor:
         self.monitor_thread.join()
         
     def _monitor(self):
+        # Bind hot lookups once; they run on every sample
+        cpu_percent = self.process.cpu_percent
+        memory_info = self.process.memory_info
+        append_cpu = self.cpu_percentages.append
+        append_mem = self.memory_usages.append
+        burst_sleep = self.burst_interval_ms / 1000
+        
         # Initial CPU measurement (first call returns 0)
-        self.process.cpu_percent()
+        cpu_percent(interval=None)
         
         while self.is_running:
-            # CPU usage as percentage
-            cpu = self.process.cpu_percent()
-            # Memory usage in MB
-            memory = self.process.memory_info().rss / (1024 * 1024)
+            burst_start = time.monotonic()
+            for _ in range(self.sample_burst):
+                # CPU usage as percentage
+                append_cpu(cpu_percent(interval=None))
+                # Memory usage in MB
+                append_mem(memory_info().rss / (1024 * 1024))
+                time.sleep(burst_sleep)
             
-            self.cpu_percentages.append(cpu)
-            self.memory_usages.append(memory)
-            
-            time.sleep(self.interval)
+            # Sleep out the rest of the sampling interval (monotonic, immune to clock changes)
+            remaining = self.sampling_interval_s - (time.monotonic() - burst_start)
+            if remaining > 0:
+                time.sleep(remaining)
     
     def get_stats(self) -> Dict:
         if not self.cpu_percentages or not self.memory_usages:
@@ -52,16 +76,35 @@ class ResourceMonitor:
                 "peak_memory_mb": 0
             }
             
-        # Remove the first few measurements as they might be inaccurate
-        cpu_samples = self.cpu_percentages[5:]
-        mem_samples = self.memory_usages[5:]
+        avg_cpu, peak_cpu = self._mean_and_peak(self.cpu_percentages)
+        avg_mem, peak_mem = self._mean_and_peak(self.memory_usages)
         
         return {
-            "avg_cpu_percent": statistics.mean(cpu_samples),
-            "peak_cpu_percent": max(cpu_samples),
-            "avg_memory_mb": statistics.mean(mem_samples),
-            "peak_memory_mb": max(mem_samples)
+            "avg_cpu_percent": avg_cpu,
+            "peak_cpu_percent": peak_cpu,
+            "avg_memory_mb": avg_mem,
+            "peak_memory_mb": peak_mem
         }
+    
+    @property
+    def warmup_samples(self) -> int:
+        """Number of leading samples (~the first second) to discard as inaccurate."""
+        return self.sample_burst * max(1, int(1.0 / self.sampling_interval_s))
+    
+    def _mean_and_peak(self, samples: Deque[float]) -> Tuple[float, float]:
+        # Skip the warm-up samples without copying, unless that would leave nothing
+        skip = self.warmup_samples if len(samples) > self.warmup_samples else 0
+        
+        # Single pass for both mean and max
+        n = 0
+        total = 0.0
+        peak = float("-inf")
+        for v in itertools.islice(samples, skip, None):
+            n += 1
+            total += v
+            if v > peak:
+                peak = v
+        return total / n, peak
 
 def benchmark_function(func, *args, **kwargs) -> Dict:
     """
@@ -88,17 +131,65 @@ def benchmark_function(func, *args, **kwargs) -> Dict:
 
 def bounce_scale(t, total_duration, min_scale=80, max_scale=100):
     """
-    Very rough replication of "bounce" scaling by interpolating scale over time
+    Very rough replication of "bounce" scaling by interpolating scale over time:
+    max_scale at t=0, min_scale at the midpoint, back to max_scale at the end.
+    Branchless, so the same expression also works on NumPy arrays of t.
     """
-    half_duration = total_duration / 2
-    if t < half_duration:
-        # Scale down
-        progress = t / half_duration
-        return max_scale - (max_scale - min_scale) * progress
-    else:
-        # Scale up
-        progress = (t - half_duration) / half_duration
-        return min_scale + (max_scale - min_scale) * progress
+    return min_scale + (max_scale - min_scale) * abs(2 * t / total_duration - 1)
+
+# Bundled Montserrat, loaded once. Pillow rasterises in-process, where TextClip
+# forked an ImageMagick `convert` for every clip.
+FONT = ImageFont.truetype(FontManager().get_font_path("Montserrat-Bold"), 100)
+STROKE_WIDTH = 2
+
+@functools.lru_cache(maxsize=None)
+def _font(size):
+    return FONT.font_variant(size=size)
+
+def _canvas_height(text, max_size=100):
+    """
+    Height of a canvas that fits the text at its largest bounce scale, plus padding.
+    """
+    probe = ImageDraw.Draw(Image.new("RGBA", (1, 1)))
+    _, top, _, bottom = probe.multiline_textbbox(
+        (0, 0), text, font=_font(max_size), stroke_width=STROKE_WIDTH
+    )
+    return bottom - top + 40
+
+def render_text(text, size, W, H):
+    """
+    Draws white, black-stroked text centred on a transparent W x H canvas and returns it as an RGBA array.
+    """
+    font = _font(size)
+    im = Image.new("RGBA", (W, H))
+    d = ImageDraw.Draw(im)
+    left, top, right, bottom = d.multiline_textbbox(
+        (0, 0), text, font=font, stroke_width=STROKE_WIDTH
+    )
+    origin = ((W - (right - left)) // 2 - left, (H - (bottom - top)) // 2 - top)
+    d.multiline_text(origin, text, font=font, fill="white", align="center",
+                     stroke_width=STROKE_WIDTH, stroke_fill="black")
+    return np.array(im)
+
+def _iter_srt(path):
+    """
+    Yields (start_ms, end_ms, text) for each cue in an SRT file.
+    Only handles the HH:MM:SS,mmm timestamps our fixtures use, which is all run_moviepy needs.
+    """
+    with open(path, encoding="utf-8") as f:
+        buf = f.read().replace("\r\n", "\n")
+    for block in buf.split("\n\n"):
+        lines = block.strip("\n").split("\n")
+        if len(lines) < 3:
+            continue
+        t = lines[1]
+        start_ms = int(t[0:2]) * 3600000 + int(t[3:5]) * 60000 + int(t[6:8]) * 1000 + int(t[9:12])
+        t = t[t.index("-->") + 4:]
+        end_ms = int(t[0:2]) * 3600000 + int(t[3:5]) * 60000 + int(t[6:8]) * 1000 + int(t[9:12])
+        yield start_ms, end_ms, "\n".join(lines[2:])
+
+# Matches the AnimationConfig used for the Beautiful Captions run
+KEYFRAMES = 10
 
 def run_beautiful_captions(test_video, output_path, animation_enabled):
     """
@@ -109,7 +200,7 @@ def run_beautiful_captions(test_video, output_path, animation_enabled):
             font_size=100,
             verticle_position=0.5, 
         ),
-        animation=AnimationConfig(enabled=animation_enabled, type="bounce", keyframes=10),
+        animation=AnimationConfig(enabled=animation_enabled, type="bounce", keyframes=KEYFRAMES),
     )
 
     subtitles_from_srt(
@@ -124,78 +215,138 @@ def run_moviepy(test_video, output_video, animation_enabled):
     Creates subtitles in MoviePy using the SRT file, with or without a simple "bounce" effect.
     """
     clip = VideoFileClip(test_video)
+    # Read metadata once; every subtitle clip reuses this single reader
+    W, H = clip.w, clip.h
+    fps = clip.fps
     
-    # Read SRT file
-    subs = pysrt.open("subtitles.srt")
     subtitle_clips = []
     
-    for sub in subs:
-        start_time = sub.start.ordinal / 1000  # Convert to seconds
-        end_time = sub.end.ordinal / 1000
-        duration = end_time - start_time
-        
-        if animation_enabled:
-            def make_frame(t):
-                scale_factor = bounce_scale(t % duration, duration, 80, 100)
-                txt_clip = (TextClip(sub.text, font="Montserrat", fontsize=scale_factor, 
-                                   color="white", stroke_color="black", stroke_width=2,
-                                   method='caption', size=(clip.w, None))
-                          .set_position(('center', 'center')))
-                return txt_clip.get_frame(0)
+    try:
+        for start_ms, end_ms, text in _iter_srt("subtitles.srt"):
+            start_time = start_ms / 1000  # Convert to seconds
+            end_time = end_ms / 1000
+            duration = end_time - start_time
             
-            animated_txt = VideoClip(make_frame, duration=duration)
-            animated_txt = animated_txt.set_start(start_time)
-            subtitle_clips.append(animated_txt)
-        else:
-            txt = (TextClip(sub.text, font="Montserrat", fontsize=100, 
-                          color="white", stroke_color="black", stroke_width=2,
-                          method='caption', size=(clip.w, None))
-                  .set_start(start_time)
-                  .set_duration(duration)
-                  .set_position(('center', 'center')))
-            subtitle_clips.append(txt)
-    
-    # Combine video with all subtitle clips
-    final = CompositeVideoClip([clip] + subtitle_clips)
-    final.write_videofile(output_video, codec="libx264", audio_codec="aac")
+            if animation_enabled:
+                # Render one image per distinct keyframe scale instead of one per video frame
+                scales = sorted({
+                    int(bounce_scale(k * duration / KEYFRAMES, duration, 80, 100))
+                    for k in range(KEYFRAMES + 1)
+                })
+                canvas_h = _canvas_height(text)
+                rendered = {s: render_text(text, s, W, canvas_h) for s in scales}
+                frames = {s: img[:, :, :3] for s, img in rendered.items()}
+                masks = {s: img[:, :, 3] / 255.0 for s, img in rendered.items()}
 
-def run_ffmpeg(test_video, output_video):
+                # Per-frame scale lookup table (100 -> 80 -> 100), snapped to the nearest cached scale
+                n = max(1, int(np.ceil(duration * fps)))
+                lut = bounce_scale(np.arange(n) / fps, duration, 80, 100)
+                scale_values = np.array(scales)
+                frame_scales = scale_values[
+                    np.abs(lut[:, None] - scale_values).argmin(axis=1)
+                ].tolist()
+
+                # Bind per-subtitle state as defaults; a plain closure would see the last loop values
+                def make_frame(t, frames=frames, frame_scales=frame_scales, n=n):
+                    return frames[frame_scales[min(int(t * fps), n - 1)]]
+
+                def make_mask(t, masks=masks, frame_scales=frame_scales, n=n):
+                    return masks[frame_scales[min(int(t * fps), n - 1)]]
+                
+                animated_txt = (VideoClip(make_frame, duration=duration)
+                                .set_mask(VideoClip(make_mask, ismask=True, duration=duration))
+                                .set_start(start_time)
+                                .set_position(('center', 'center')))
+                subtitle_clips.append(animated_txt)
+            else:
+                txt = (ImageClip(render_text(text, 100, W, _canvas_height(text)))
+                      .set_start(start_time)
+                      .set_duration(duration)
+                      .set_position(('center', 'center')))
+                subtitle_clips.append(txt)
+        
+        # Combine video with all subtitle clips
+        final = CompositeVideoClip([clip] + subtitle_clips)
+
+        # Pipe raw frames straight into one ffmpeg encoder instead of write_videofile;
+        # audio is taken from the source file rather than re-rendered by MoviePy
+        streams = [ffmpeg.input('pipe:', format='rawvideo', pix_fmt='rgb24', s=f'{W}x{H}', r=fps)]
+        if clip.audio is not None:
+            streams.append(ffmpeg.input(test_video).audio)
+        proc = (
+            ffmpeg.output(*streams, output_video, vcodec='libx264', preset='veryfast',
+                          pix_fmt='yuv420p', acodec='aac')
+            .overwrite_output()
+            .global_args('-loglevel', 'error')
+            .run_async(pipe_stdin=True)
+        )
+        for frame in final.iter_frames(fps=fps, dtype='uint8'):
+            proc.stdin.write(frame.tobytes())
+        proc.stdin.close()
+        if proc.wait() != 0:
+            raise RuntimeError(f"ffmpeg exited with code {proc.returncode}")
+    finally:
+        # Release the ffmpeg reader and any per-clip resources
+        clip.close()
+        for c in subtitle_clips:
+            c.close()
+
+def run_ffmpeg(test_video, output_video, preset="veryfast"):
     """
     Creates subtitles using FFmpeg's built-in subtitle filter.
     Note: animation_enabled is ignored as FFmpeg doesn't support animation.
+    Uses the hardware encoder the library would pick (one that passes a trial encode,
+    not just one compiled into FFmpeg), otherwise libx264 with the given preset.
     """
     import subprocess
     
-    # First convert SRT to ASS format as FFmpeg handles ASS better
+    # The subtitles filter reads SRT directly, so no separate SRT->ASS conversion pass is needed
     srt_path = "subtitles.srt"
-    ass_path = "temp_subtitles.ass"
-    
-    cmd_convert = [
-        "ffmpeg", "-i", srt_path,
-        "-y",  # Overwrite output file
-        ass_path
-    ]
     
-    # Then combine video with subtitles
+    encoder = _detect_hw_encoder()
+    input_args = []
+    video_filter = f"subtitles={srt_path}:force_style='FontName=Montserrat,FontSize=100'"
+    if encoder == "h264_nvenc":
+        # Decode on the GPU but keep frames in system memory so the subtitle filter can draw on them
+        input_args = ["-hwaccel", "cuda"]
+        encoder_args = ["-c:v", "h264_nvenc", "-preset", "p4", "-b:v", "6M"]
+    elif encoder == "h264_qsv":
+        encoder_args = ["-c:v", "h264_qsv", "-b:v", "6M"]
+    elif encoder == "h264_videotoolbox":
+        encoder_args = ["-c:v", "h264_videotoolbox", "-b:v", "6M"]
+    elif encoder == "h264_vaapi":
+        input_args = ["-vaapi_device", VAAPI_DEVICE]
+        video_filter += ",format=nv12,hwupload"
+        encoder_args = ["-c:v", "h264_vaapi", "-b:v", "6M"]
+    else:
+        encoder_args = [
+            "-c:v", "libx264",
+            "-preset", preset,
+            "-tune", "fastdecode",
+            "-threads", "0",  # Let x264 pick a thread count for all cores
+            "-x264-params", "aq-mode=0",
+        ]
+
     cmd_subtitle = [
         "ffmpeg",
+        *input_args,
         "-i", test_video,
-        "-vf", f"ass={ass_path}",
+        "-vf", video_filter,
+        *encoder_args,
         "-c:a", "copy",
         "-y",
         output_video
     ]
     
     try:
-        # Convert SRT to ASS
-        subprocess.run(cmd_convert, check=True, capture_output=True)
-        
-        # Add subtitles to video
-        subprocess.run(cmd_subtitle, check=True, capture_output=True)
-    finally:
-        # Clean up temporary ASS file
-        if os.path.exists(ass_path):
-            os.remove(ass_path)
+        # Discard output instead of buffering it: FFmpeg writes progress to stderr for the
+        # whole encode, and a captured pipe keeps growing in this process
+        subprocess.run(cmd_subtitle, check=True,
+                       stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+    except subprocess.CalledProcessError:
+        # Re-run with output captured so the failure reason is visible
+        result = subprocess.run(cmd_subtitle, capture_output=True, text=True)
+        raise RuntimeError(f"FFmpeg benchmark encode failed:\n{result.stderr}") from None
 
 def format_stats(stats: Dict) -> str:
     """Format benchmark stats for display"""
@@ -258,7 +409,7 @@ def print_comparison_table(results: Dict[str, Dict]):
     
     print(separator + "\n")
 
-def run_all_benchmarks():
+def run_all_benchmarks(parallel: bool = False):
     test_video = "input.mp4"
     
     # Create output directory if it doesn't exist
@@ -271,25 +422,37 @@ def run_all_benchmarks():
     moviepy_out_anim = os.path.join(output_dir, "moviepy_anim.mp4")
     ffmpeg_out = os.path.join(output_dir, "ffmpeg.mp4")
 
-    print("\nRunning FFmpeg (Basic Subtitles)...")
-    res_ffmpeg = benchmark_function(
-        run_ffmpeg, test_video, ffmpeg_out
-    )
+    # Each method writes its own output file, so they can run side by side with
+    # --parallel; that only gives a quick smoke run, not comparable numbers
+    jobs = {
+        "FFmpeg (Basic Subtitles)": (run_ffmpeg, test_video, ffmpeg_out),
+        "Beautiful Captions (With Animation)": (run_beautiful_captions, test_video, bc_out_anim, True),
+        "MoviePy (No Animation)": (run_moviepy, test_video, moviepy_out_noanim, False),
+        "MoviePy (With Animation)": (run_moviepy, test_video, moviepy_out_anim, True),
+    }
 
-    print("\nRunning Beautiful Captions (With Animation)...")
-    res_bc_anim = benchmark_function(
-        run_beautiful_captions, test_video, bc_out_anim, True
-    )
-
-    print("\nRunning MoviePy (No Animation)...")
-    res_moviepy_noanim = benchmark_function(
-        run_moviepy, test_video, moviepy_out_noanim, False
-    )
+    if parallel:
+        print("\nRunning all methods in parallel processes.")
+        print("NOTE: methods compete for cores, so neither times nor CPU/RAM stats are")
+        print("      comparable between methods. Drop --parallel when comparing them.")
+        max_workers = max(1, (os.cpu_count() or 1) // 4)
+        with concurrent.futures.ProcessPoolExecutor(max_workers=max_workers) as executor:
+            # ResourceMonitor is created inside benchmark_function, i.e. in the child process
+            futures = {
+                name: executor.submit(benchmark_function, *job)
+                for name, job in jobs.items()
+            }
+            results = {name: future.result() for name, future in futures.items()}
+    else:
+        results = {}
+        for name, job in jobs.items():
+            print(f"\nRunning {name}...")
+            results[name] = benchmark_function(*job)
 
-    print("\nRunning MoviePy (With Animation)...")
-    res_moviepy_anim = benchmark_function(
-        run_moviepy, test_video, moviepy_out_anim, True
-    )
+    res_ffmpeg = results["FFmpeg (Basic Subtitles)"]
+    res_bc_anim = results["Beautiful Captions (With Animation)"]
+    res_moviepy_noanim = results["MoviePy (No Animation)"]
+    res_moviepy_anim = results["MoviePy (With Animation)"]
 
     print("\n======== BENCHMARK RESULTS ========\n")
     print(f"FFmpeg              : {format_stats(res_ffmpeg)}")
@@ -300,4 +463,4 @@ def run_all_benchmarks():
     print(f"\nOutput videos saved in: {output_dir}/")
 
 if __name__ == "__main__":
-    run_all_benchmarks()
+    run_all_benchmarks(parallel="--parallel" in sys.argv)
@@ -2,7 +2,6 @@
 #TODO: add moviepy comparison to the readme
 #TODO: what happens if i dont pass in an animation?
 #TODO: What happens if i pass in a bad animation, color, font, etc?
-#TODO: need to figure out how to stop generating the Speaker labels because they're not needed probably
 #TODO: I should have a configurable output path
 #TODO: I should generate all temp files in a temp directory
 #TODO: Need to fix benchmarking so that the moviepy captions are correct and not wack
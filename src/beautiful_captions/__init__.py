@@ -1,7 +1,13 @@
 """Beautiful Captions - Fast and elegant video captioning library."""
 
 from .core.config import CaptionConfig, StyleConfig, AnimationConfig, DiarizationConfig
-from .core.caption import subtitles_from_srt, add_subtitles, extract_subtitles, caption_stream
+from .core.caption import (
+    subtitles_from_srt,
+    add_subtitles,
+    batch_process,
+    extract_subtitles,
+    caption_stream,
+)
 from .core.video import Video
 from .styling.style import StyleManager, FontManager
 from .styling.animation import AnimationFactory, create_animation_for_subtitle
@@ -13,6 +19,7 @@ __all__ = [
     # Main functions
     "subtitles_from_srt",
     "add_subtitles",
+    "batch_process",
     "extract_subtitles",
     "caption_stream",
 
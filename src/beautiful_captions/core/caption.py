@@ -1,15 +1,15 @@
 """Functional API for video captioning."""
 
+import asyncio
 import logging
 from pathlib import Path
-from typing import Any, Dict, Optional, Union
-
-from src.beautiful_captions.core.types import ServiceType
+from typing import Any, Dict, Iterable, List, Optional, Union
 
 from ..transcription.assemblyai import AssemblyAIService
 from ..transcription.base import TranscriptionService
 from ..utils.subtitles import style_srt_content
 from .config import CaptionConfig, DiarizationConfig, StyleConfig
+from .types import ServiceType
 from .video import Video
 
 logger = logging.getLogger(__name__)
@@ -154,13 +154,58 @@ async def add_subtitles(
             with open(srt_output_path, "w", encoding="utf-8") as f:
                 f.write(styled_srt)
 
-        video_output = video.add_captions(output_path=output_path, cuda=cuda)
+        video_output = await video.add_captions_async(
+            output_path=output_path, cuda=cuda
+        )
 
     if srt_output_path:
         return video_output, srt_output_path
     return video_output
 
 
+async def batch_process(
+    video_paths: Iterable[Union[str, Path]],
+    *,
+    concurrency: int = 4,
+    **kwargs: Any,
+) -> List[Union[Path, tuple[Path, Path]]]:
+    """Caption several videos concurrently.
+
+    Each video goes through ``add_subtitles`` with the same keyword arguments.
+    Up to ``concurrency`` videos are in flight at once, so one video's upload
+    and transcription overlap with another's encode; encodes themselves are
+    additionally limited to what the encoder can take.
+
+    Args:
+        video_paths: Paths to input videos
+        concurrency: Maximum number of videos processed at the same time
+        **kwargs: Passed to ``add_subtitles`` (e.g. transcribe_with, api_key, style).
+                  Output paths default to ``<name>_captioned`` next to each input.
+
+    Returns:
+        Results of ``add_subtitles`` in the same order as ``video_paths``
+
+    Examples:
+        ```python
+        outputs = await batch_process(
+            ["a.mp4", "b.mp4", "c.mp4"], transcribe_with="assemblyai", api_key=API_KEY
+        )
+        ```
+    """
+    if concurrency < 1:
+        raise ValueError("concurrency must be at least 1")
+    if "output_path" in kwargs or "srt_output_path" in kwargs:
+        raise ValueError("output_path and srt_output_path are per video, use add_subtitles")
+
+    semaphore = asyncio.Semaphore(concurrency)
+
+    async def _process(video_path: Union[str, Path]) -> Union[Path, tuple[Path, Path]]:
+        async with semaphore:
+            return await add_subtitles(video_path, **kwargs)
+
+    return list(await asyncio.gather(*(_process(path) for path in video_paths)))
+
+
 async def subtitles_from_srt(
     video_path: Union[str, Path],
     srt_input_path: Optional[Union[str, Path]] = None,
@@ -211,7 +256,7 @@ async def subtitles_from_srt(
             with open(srt_input_path, "r", encoding="utf-8") as f:
                 srt_content = f.read()
 
-        video_output = video.add_captions(
+        video_output = await video.add_captions_async(
             srt_content=srt_content,
             output_path=output_path,
             add_styling=False,
@@ -1,6 +1,12 @@
+import sys
 from dataclasses import dataclass, field
 from typing import Dict, List, Optional
 
+# Configs are immutable; slots (Python 3.10+) also drop the per-instance __dict__
+_CONFIG_OPTIONS = {"frozen": True}
+if sys.version_info >= (3, 10):
+    _CONFIG_OPTIONS["slots"] = True
+
 
 def default_censored_words() -> Dict[str, str]:
     """Default dictionary of words to censor."""
@@ -41,7 +47,7 @@ def default_censored_words() -> Dict[str, str]:
     }
 
 
-@dataclass
+@dataclass(**_CONFIG_OPTIONS)
 class StyleConfig:
     font: str = "Montserrat"
     verticle_position: float = 0.5
@@ -57,17 +63,17 @@ class StyleConfig:
     def __post_init__(self):
         # Initialize with default censored words if censorship is enabled but no custom words provided
         if self.censor_subtitles and self.custom_censored_words is None:
-            self.custom_censored_words = default_censored_words()
+            object.__setattr__(self, "custom_censored_words", default_censored_words())
 
 
-@dataclass
+@dataclass(**_CONFIG_OPTIONS)
 class AnimationConfig:
     enabled: bool = True
     type: str = "bounce"
     keyframes: int = 10
 
 
-@dataclass
+@dataclass(**_CONFIG_OPTIONS)
 class DiarizationConfig:
     enabled: bool = True
     colors: List[str] = field(default_factory=lambda: ["white", "yellow", "red"])
@@ -75,16 +81,17 @@ class DiarizationConfig:
     keep_speaker_labels: bool = False
 
 
-@dataclass
+@dataclass(**_CONFIG_OPTIONS)
 class CaptionConfig:
     style: StyleConfig = field(default_factory=StyleConfig)
     animation: AnimationConfig = field(default_factory=AnimationConfig)
     diarization: DiarizationConfig = field(default_factory=DiarizationConfig)
 
     def __post_init__(self):
+        # Frozen dataclass: normalise dict arguments via object.__setattr__
         if isinstance(self.style, dict):
-            self.style = StyleConfig(**self.style)
+            object.__setattr__(self, "style", StyleConfig(**self.style))
         if isinstance(self.animation, dict):
-            self.animation = AnimationConfig(**self.animation)
+            object.__setattr__(self, "animation", AnimationConfig(**self.animation))
         if isinstance(self.diarization, dict):
-            self.diarization = DiarizationConfig(**self.diarization)
+            object.__setattr__(self, "diarization", DiarizationConfig(**self.diarization))
@@ -1,3 +1,6 @@
 from typing import Literal
 
 ServiceType = Literal["assemblyai", "deepgram", "openai"]
+
+# libx264 speed/size trade-off, see utils.ffmpeg._X264_QUALITY_ARGS
+EncodeQuality = Literal["fast", "balanced", "archival"]
@@ -1,19 +1,42 @@
 """Video processing and captioning core functionality."""
 
+import asyncio
+import functools
+import io
+import os
 from pathlib import Path
-from typing import Optional, Union, cast
-
-from src.beautiful_captions.core.types import ServiceType
+from typing import BinaryIO, List, Optional, Tuple, Union, cast
 
 from ..core.config import CaptionConfig
-from ..transcription.base import TranscriptionService
-from ..utils.ffmpeg import combine_video_subtitles, extract_audio
-from ..utils.subtitles import create_ass_subtitles, style_srt_content
+from ..core.types import EncodeQuality, ServiceType
+from ..transcription.base import TranscriptionService, Utterance
+from ..utils.ffmpeg import (
+    SUBTITLE_PIPE,
+    _check_encode_quality,
+    combine_video_subtitles,
+    combine_video_subtitles_async,
+    decode_audio_async,
+    extract_audio_async,
+)
+from ..utils.subtitles import (
+    create_ass_subtitles,
+    render_ass_subtitles,
+    style_srt_content,
+)
 
 
 class Video:
     """Main video processing class for adding captions."""
 
+    __slots__ = (
+        "video_path",
+        "config",
+        "_audio_path",
+        "_srt_content",
+        "_ass_path",
+        "_utterances",
+    )
+
     def __init__(
         self, video_path: Union[str, Path], config: Optional[CaptionConfig] = None
     ):
@@ -31,6 +54,7 @@ class Video:
         self._audio_path: Optional[Path] = None
         self._srt_content: Optional[str] = None
         self._ass_path: Optional[Path] = None
+        self._utterances: Optional[List[Utterance]] = None
 
     async def transcribe(
         self,
@@ -57,9 +81,16 @@ class Video:
             service = cast(ServiceType, service)
             service = create_transcription_service(service, api_key)
 
-        if not self._audio_path:
-            self._audio_path = self.video_path.with_suffix(".aac")
-            extract_audio(self.video_path, self._audio_path)
+        audio: Union[str, BinaryIO]
+        if service.accepts_audio_stream and not self._audio_path:
+            # Decode to WAV in memory and upload that, no intermediate file.
+            # A seekable buffer (unlike a pipe) lets the upload declare its size.
+            audio = io.BytesIO(await decode_audio_async(self.video_path))
+        else:
+            if not self._audio_path:
+                self._audio_path = self.video_path.with_suffix(".aac")
+                await extract_audio_async(self.video_path, self._audio_path)
+            audio = str(self._audio_path)
 
         # Get censorship settings from style config
         censor_subtitles = getattr(self.config.style, "censor_subtitles", False)
@@ -67,19 +98,23 @@ class Video:
             self.config.style, "custom_censored_words", None
         )
 
+        # Skip server-side diarization entirely when speaker colors are off
+        enable_diarization = self.config.diarization.enabled
+
         # Transcribe with optional censorship
         self._utterances = await service.transcribe(
-            str(self._audio_path),
+            audio,
             max_speakers,
             censor_subtitles=censor_subtitles,
             custom_censored_words=custom_censored_words,
+            enable_diarization=enable_diarization,
         )
 
         self._srt_content = service.to_srt(
             self._utterances,
             self.config.diarization.colors,
             max_words_per_line=self.config.style.max_words_per_line,
-            include_speaker_labels=True,
+            include_speaker_labels=enable_diarization,
         )
 
     def add_captions(
@@ -89,17 +124,118 @@ class Video:
         output_path: Optional[Union[str, Path]] = None,
         add_styling: Optional[bool] = True,
         cuda: Optional[bool] = False,
+        burn_in: bool = True,
+        encode_quality: EncodeQuality = "balanced",
     ) -> Path:
         """Add captions to video.
 
         Args:
-            srt_path: Optional path to SRT file
-            srt_content: Optional SRT content string (ignored if srt_path is provided)
+            srt_input_path: Optional path to SRT file
+            srt_content: Optional SRT content string (ignored if srt_input_path is provided)
             output_path: Optional output path (defaults to input path with _captioned suffix)
+            add_styling: Apply speaker colors and max_words_per_line to the SRT content
+            cuda: Decode and encode on an NVIDIA GPU (falls back to libx264 if NVENC is missing)
+            burn_in: Render captions into the video frames. Set to False to add them
+                as a soft subtitle track without re-encoding; the bounce animation
+                and speaker colors are only visible when burned in.
+            encode_quality: "fast", "balanced" or "archival"; trades libx264 encode
+                speed for file size when no hardware encoder is available
+
+        Returns:
+            Path to output video file
+
+        Raises:
+            ValueError: If encode_quality is not one of the settings above
+        """
+        _check_encode_quality(encode_quality)
+
+        captioned_path, _ = self._build_ass(
+            srt_input_path, srt_content, output_path, add_styling
+        )
+        if self._ass_path is None:
+            raise RuntimeError("ASS subtitles were not written")
+
+        combine_video_subtitles(
+            self.video_path, self._ass_path, captioned_path, cuda, burn_in, encode_quality
+        )
+
+        return captioned_path
+
+    async def add_captions_async(
+        self,
+        srt_input_path: Optional[Union[str, Path]] = None,
+        srt_content: Optional[str] = None,
+        output_path: Optional[Union[str, Path]] = None,
+        add_styling: Optional[bool] = True,
+        cuda: Optional[bool] = False,
+        burn_in: bool = True,
+        encode_quality: EncodeQuality = "balanced",
+    ) -> Path:
+        """Add captions to video without blocking the event loop.
+
+        The ASS subtitles are built in a worker thread and FFmpeg runs as an
+        asyncio subprocess, so many videos can be captioned concurrently with
+        ``asyncio.gather``. When burning in on POSIX systems the ASS script is
+        piped to FFmpeg instead of being written to disk. Arguments are the
+        same as ``add_captions``.
 
         Returns:
             Path to output video file
         """
+        _check_encode_quality(encode_quality)
+
+        pipe_ass = burn_in and os.name == "posix"
+
+        loop = asyncio.get_running_loop()
+        captioned_path, ass_content = await loop.run_in_executor(
+            None,
+            functools.partial(
+                self._build_ass,
+                srt_input_path,
+                srt_content,
+                output_path,
+                add_styling,
+                write=not pipe_ass,
+            ),
+        )
+
+        subtitle_path: Union[str, Path]
+        if ass_content is not None:
+            subtitle_path = SUBTITLE_PIPE
+        elif self._ass_path is not None:
+            subtitle_path = self._ass_path
+        else:
+            raise RuntimeError("ASS subtitles were not written")
+
+        await combine_video_subtitles_async(
+            self.video_path,
+            subtitle_path,
+            captioned_path,
+            cuda,
+            burn_in,
+            encode_quality,
+            subtitle_content=ass_content,
+        )
+
+        return captioned_path
+
+    def _build_ass(
+        self,
+        srt_input_path: Optional[Union[str, Path]],
+        srt_content: Optional[str],
+        output_path: Optional[Union[str, Path]],
+        add_styling: Optional[bool],
+        write: bool = True,
+    ) -> Tuple[Path, Optional[str]]:
+        """Style the SRT content and write the ASS file next to the output video.
+
+        Args:
+            write: If False, return the ASS content instead of writing the file
+
+        Returns:
+            Tuple of (path the captioned video should be written to,
+            ASS content if ``write`` is False, otherwise None)
+        """
         # Get SRT content from file or string or transcription
         if srt_input_path:
             with open(srt_input_path, "r", encoding="utf-8") as f:
@@ -132,9 +268,18 @@ class Video:
             output_path = self.video_path.with_stem(f"{self.video_path.stem}_captioned")
 
         output_path = Path(output_path)
-        self._ass_path = output_path.with_suffix(".ass")
-
         _srt_content = srt_content if srt_content else ""
+
+        if not write:
+            ass_content = render_ass_subtitles(
+                _srt_content,
+                self.video_path,
+                self.config.style,
+                self.config.animation,
+            )
+            return output_path, ass_content
+
+        self._ass_path = output_path.with_suffix(".ass")
         create_ass_subtitles(
             _srt_content,
             self.video_path,
@@ -143,9 +288,7 @@ class Video:
             self.config.animation,
         )
 
-        combine_video_subtitles(self.video_path, self._ass_path, output_path, cuda)
-
-        return output_path
+        return output_path, None
 
     def cleanup(self) -> None:
         """Remove temporary files."""
@@ -1,5 +1,6 @@
 """Style processing for captions."""
 
+import functools
 import os
 from pathlib import Path
 from typing import Dict, Optional
@@ -7,32 +8,40 @@ import logging
 
 logger = logging.getLogger(__name__)
 
+FONT_DIR = Path(__file__).parent.parent / "fonts"
+
+@functools.lru_cache(maxsize=1)
+def _discover_fonts() -> Dict[str, str]:
+    """Load available fonts and their display names.
+    
+    The bundled font directory never changes at runtime, so the scan is
+    done once and shared by every FontManager.
+    
+    Returns:
+        Dictionary mapping display names to font files
+    """
+    fonts = {}
+    # scandir + suffix check avoids glob's fnmatch and a Path object per entry
+    with os.scandir(FONT_DIR) as entries:
+        for entry in entries:
+            if entry.name.endswith(".ttf") and entry.is_file():
+                fonts[entry.name[:-4]] = entry.path
+        
+    return fonts
+
 class FontManager:
     """Manages font availability and paths."""
     
     def __init__(self):
         """Initialize font manager."""
-        self.font_dir = Path(__file__).parent.parent / "fonts"
-        self.font_map = self._load_fonts()
-        
-    def _load_fonts(self) -> Dict[str, str]:
-        """Load available fonts and their display names.
-        
-        Returns:
-            Dictionary mapping display names to font files
-        """
-        fonts = {}        
-        for font_file in self.font_dir.glob("*.ttf"):
-            base_name = font_file.stem
-            fonts[base_name] = str(font_file)
-            
-        return fonts
+        self.font_dir = FONT_DIR
+        self.font_map = _discover_fonts()
     
-    def get_font_mapping(self, font) -> Dict[str, str]:
-        """Load available fonts and their display names.
+    def get_font_mapping(self, font: str) -> Optional[str]:
+        """Look up the display name of a bundled font.
         
         Returns:
-            Dictionary mapping display names to font files
+            Display name of the font, or None if it is not bundled
         """
         font_lookup = {
             "CheGuevaraBarry-Brown": "CheGuevara Barry Brown",
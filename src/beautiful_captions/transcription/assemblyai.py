@@ -1,16 +1,26 @@
 import logging
 import os
-from typing import List, Optional, Dict
+from typing import BinaryIO, Dict, Iterator, List, Optional, Union
 import assemblyai as aai
-from datetime import timedelta
 import asyncio
 from .base import TranscriptionService, Utterance, Word
+from ..utils.subtitles import group_words_into_lines
 
 logger = logging.getLogger(__name__)
 
+def _format_timestamp(ms: int) -> str:
+    """Format a millisecond offset as an SRT timestamp (HH:MM:SS,mmm)."""
+    s, ms = divmod(ms, 1000)
+    m, s = divmod(s, 60)
+    h, m = divmod(m, 60)
+    return f"{h:02d}:{m:02d}:{s:02d},{ms:03d}"
+
 class AssemblyAIService(TranscriptionService):
     """AssemblyAI transcription service implementation."""
     
+    # The SDK uploads file-like objects directly
+    accepts_audio_stream = True
+    
     def __init__(self, api_key: str):
         """Initialize AssemblyAI client."""
         super().__init__(api_key)
@@ -18,38 +28,45 @@ class AssemblyAIService(TranscriptionService):
         
     async def transcribe(
         self,
-        audio_path: str,
+        audio_path: Union[str, BinaryIO],
         max_speakers: int = 3,
         censor_subtitles: bool = False,
-        custom_censored_words: Optional[Dict[str, str]] = None
+        custom_censored_words: Optional[Dict[str, str]] = None,
+        enable_diarization: bool = True
     ) -> List[Utterance]:
         """Transcribe audio using AssemblyAI with optional censorship.
         
         Args:
-            audio_path: Path to audio file
+            audio_path: Path to audio file, or a binary audio stream to upload
             max_speakers: Maximum number of speakers to identify
             censor_subtitles: Whether to censor profanity in subtitles
             custom_censored_words: Dictionary of words to censor {word: censored_version}
+            enable_diarization: Whether to run speaker diarization. When False the
+                (slower) speaker labelling stage is skipped and all words are
+                returned as a single "Speaker A" utterance.
         """
-        logger.info(f"Transcribing audio with AssemblyAI: {audio_path}")
-        
-        # Check if file exists and log details for debugging
-        if not os.path.exists(audio_path):
-            raise FileNotFoundError(f"Audio file not found: {audio_path}")
+        if isinstance(audio_path, str):
+            logger.info(f"Transcribing audio with AssemblyAI: {audio_path}")
             
-        logger.info(f"Audio file size: {os.path.getsize(audio_path)} bytes")
+            # Check if file exists and log details for debugging
+            if not os.path.exists(audio_path):
+                raise FileNotFoundError(f"Audio file not found: {audio_path}")
+                
+            logger.info(f"Audio file size: {os.path.getsize(audio_path)} bytes")
+        else:
+            logger.info("Transcribing audio stream with AssemblyAI")
         
         config = aai.TranscriptionConfig(
             speech_models=["universal-2"],
-            speaker_labels=True,
-            speakers_expected=max_speakers,
+            speaker_labels=enable_diarization,
+            speakers_expected=max_speakers if enable_diarization else None,
             language_detection=True,
             filter_profanity=censor_subtitles
         )
         
         try:
             # Handle the synchronous SDK in an async context
-            utterances = await asyncio.to_thread(self._transcribe_sync, audio_path, config)
+            utterances = await asyncio.to_thread(self._transcribe_sync, audio_path, config, enable_diarization)
             
             # Apply custom word censoring if provided
             if custom_censored_words and isinstance(custom_censored_words, dict):
@@ -61,12 +78,12 @@ class AssemblyAIService(TranscriptionService):
             logger.error(f"AssemblyAI transcription failed: {str(e)}")
             raise
     
-    def _transcribe_sync(self, audio_path: str, config: aai.TranscriptionConfig) -> List[Utterance]:
+    def _transcribe_sync(self, audio_path: Union[str, BinaryIO], config: aai.TranscriptionConfig, enable_diarization: bool = True) -> List[Utterance]:
         """Synchronous implementation that will be run in a separate thread."""
         transcriber = aai.Transcriber(config=config)
         
         # Use the direct transcribe method which handles submission and polling
-        logger.info(f"Starting transcription of {audio_path}")
+        logger.info(f"Starting transcription of {audio_path if isinstance(audio_path, str) else 'audio stream'}")
         transcript = transcriber.transcribe(audio_path)
         
         logger.info(f"Transcription complete, status: {getattr(transcript, 'status', 'unknown')}")
@@ -77,6 +94,26 @@ class AssemblyAIService(TranscriptionService):
         
         utterances: List[Utterance] = []
         
+        if not enable_diarization:
+            # Without speaker labels AssemblyAI does not populate utterances,
+            # so treat the whole transcript as a single speaker
+            words = [
+                Word(
+                    text=w.text,
+                    start=w.start,
+                    end=w.end
+                )
+                for w in (transcript.words or [])
+            ]
+            if words:
+                utterances.append(Utterance(
+                    speaker="Speaker A",
+                    words=words,
+                    start=words[0].start,
+                    end=words[-1].end
+                ))
+            return utterances
+        
         for u in transcript.utterances:
             words = [
                 Word(
@@ -141,9 +178,26 @@ class AssemblyAIService(TranscriptionService):
         Returns:
             SRT formatted string with speaker labels
         """
-        from ..utils.subtitles import group_words_into_lines
+        return "".join(
+            self.iter_srt(utterances, speaker_colors, max_words_per_line, include_speaker_labels)
+        )
+    
+    def iter_srt(self, utterances: List[Utterance], speaker_colors: List[str], max_words_per_line: int = 1, include_speaker_labels: bool = True) -> Iterator[str]:
+        """Yield plain SRT blocks one subtitle at a time.
         
-        srt_content = ""
+        Lets callers stream long transcripts to a file, e.g.
+        ``f.writelines(service.iter_srt(utterances, colors))``, without
+        holding the whole SRT in memory.
+        
+        Args:
+            utterances: List of transcribed utterances
+            speaker_colors: List of colors (used for speaker identification)
+            max_words_per_line: Maximum number of words per line
+            include_speaker_labels: Whether to include speaker labels in the output
+            
+        Yields:
+            One SRT block (index, timing, text and trailing blank line) per subtitle
+        """
         subtitle_index = 1
         
         for utterance in utterances:
@@ -161,43 +215,25 @@ class AssemblyAIService(TranscriptionService):
                         group_start = utterance.words[word_index].start
                         group_end = utterance.words[word_index + line_word_count - 1].end
                         
-                        # Format times for SRT
-                        start_time = timedelta(milliseconds=group_start)
-                        end_time = timedelta(milliseconds=group_end)
-                        
-                        start_str = f"{start_time.seconds // 3600:02d}:{(start_time.seconds % 3600) // 60:02d}:{start_time.seconds % 60:02d},{start_time.microseconds // 1000:03d}"
-                        end_str = f"{end_time.seconds // 3600:02d}:{(end_time.seconds % 3600) // 60:02d}:{end_time.seconds % 60:02d},{end_time.microseconds // 1000:03d}"
-                        
-                        srt_content += f"{subtitle_index}\n"
-                        srt_content += f"{start_str} --> {end_str}\n"
-                        
                         # Add speaker label if requested
-                        if include_speaker_labels:
-                            srt_content += f"{utterance.speaker}: {line}\n\n"
-                        else:
-                            srt_content += f"{line}\n\n"
+                        text = f"{utterance.speaker}: {line}" if include_speaker_labels else line
+                        yield (
+                            f"{subtitle_index}\n"
+                            f"{_format_timestamp(group_start)} --> {_format_timestamp(group_end)}\n"
+                            f"{text}\n\n"
+                        )
                         
                         subtitle_index += 1
                         word_index += line_word_count
             else:
                 # Original single-word behavior
                 for word in utterance.words:
-                    start_time = timedelta(milliseconds=word.start)
-                    end_time = timedelta(milliseconds=word.end)
-                    
-                    # Format times for SRT
-                    start_str = f"{start_time.seconds // 3600:02d}:{(start_time.seconds % 3600) // 60:02d}:{start_time.seconds % 60:02d},{start_time.microseconds // 1000:03d}"
-                    end_str = f"{end_time.seconds // 3600:02d}:{(end_time.seconds % 3600) // 60:02d}:{end_time.seconds % 60:02d},{end_time.microseconds // 1000:03d}"
-                    
-                    srt_content += f"{subtitle_index}\n"
-                    srt_content += f"{start_str} --> {end_str}\n"
-                    
                     # Add speaker label if requested
-                    if include_speaker_labels:
-                        srt_content += f"{utterance.speaker}: {word.text}\n\n"
-                    else:
-                        srt_content += f"{word.text}\n\n"
+                    text = f"{utterance.speaker}: {word.text}" if include_speaker_labels else word.text
+                    yield (
+                        f"{subtitle_index}\n"
+                        f"{_format_timestamp(word.start)} --> {_format_timestamp(word.end)}\n"
+                        f"{text}\n\n"
+                    )
                     
                     subtitle_index += 1
-                
-        return srt_content
@@ -1,5 +1,5 @@
 from abc import ABC, abstractmethod
-from typing import List, Optional, Dict
+from typing import BinaryIO, List, Optional, Dict, Union
 from dataclasses import dataclass
 
 @dataclass
@@ -16,25 +16,32 @@ class Utterance:
     end: int    # milliseconds
 
 class TranscriptionService(ABC):
+    # Whether transcribe() accepts a binary audio stream as well as a file path
+    accepts_audio_stream: bool = False
+
     def __init__(self, api_key: str):
         self.api_key = api_key
 
     @abstractmethod
     async def transcribe(
         self, 
-        audio_path: str, 
+        audio_path: Union[str, BinaryIO], 
         max_speakers: int = 3,
         censor_subtitles: bool = False,
-        custom_censored_words: Optional[Dict[str, str]] = None
+        custom_censored_words: Optional[Dict[str, str]] = None,
+        enable_diarization: bool = True
     ) -> List[Utterance]:
         """
         Transcribe audio file and return list of utterances with speaker diarization
         
         Args:
-            audio_path: Path to the audio file
+            audio_path: Path to the audio file, or a binary audio stream if
+                ``accepts_audio_stream`` is True
             max_speakers: Maximum number of speakers to identify
             censor_subtitles: Whether to censor profanity in subtitles
             custom_censored_words: Dictionary of words to censor {word: censored_version}
+            enable_diarization: Whether to label speakers; when False all words
+                belong to a single speaker
         """
         pass
 
@@ -1,13 +1,138 @@
 """FFmpeg utilities for video and audio processing."""
 
+import asyncio
+import functools
 import logging
+import os
+import weakref
 from pathlib import Path
-from typing import Union, Tuple, Optional
+from typing import Dict, FrozenSet, List, Union, Tuple, Optional
 import subprocess
+from ..core.types import EncodeQuality
 from ..styling.style import FontManager
 
 logger = logging.getLogger(__name__)
 
+@functools.lru_cache(maxsize=1)
+def available_encoders() -> FrozenSet[str]:
+    """Get the names of the video/audio encoders compiled into FFmpeg.
+
+    The probe runs once per process and is cached.
+
+    Returns:
+        Set of encoder names (e.g. ``h264_nvenc``), empty if FFmpeg could not be queried
+    """
+    try:
+        result = subprocess.run(
+            ['ffmpeg', '-hide_banner', '-encoders'],
+            check=True, capture_output=True, text=True
+        )
+    except (OSError, subprocess.CalledProcessError) as e:
+        logger.warning(f"Could not query FFmpeg encoders: {e}")
+        return frozenset()
+
+    encoders = set()
+    for line in result.stdout.splitlines():
+        # Encoder lines look like " V....D h264_nvenc  NVIDIA NVENC H.264 encoder"
+        parts = line.split()
+        if len(parts) >= 2 and len(parts[0]) == 6:
+            encoders.add(parts[1])
+    return frozenset(encoders)
+
+async def decode_audio_async(video_path: Union[str, Path], sample_rate: int = 16000) -> bytes:
+    """Decode the audio track to 16-bit mono WAV without blocking the event loop.
+
+    Args:
+        video_path: Input video file path
+        sample_rate: Output sample rate in Hz
+
+    Returns:
+        WAV file contents
+
+    Raises:
+        subprocess.CalledProcessError: If FFmpeg command fails (e.g. no audio track)
+    """
+    try:
+        return await _run_async_bytes(_decode_audio_cmd(video_path, sample_rate))
+
+    except subprocess.CalledProcessError as e:
+        logger.error(f"FFmpeg audio decoding failed: {e.stderr}")
+        raise
+
+def _decode_audio_cmd(video_path: Union[str, Path], sample_rate: int) -> List[str]:
+    return [
+        'ffmpeg',
+        '-nostdin',
+        '-i', str(video_path),
+        '-vn',  # No video
+        '-ac', '1',  # Mono
+        '-ar', str(sample_rate),
+        '-f', 'wav',
+        '-loglevel', 'error',
+        'pipe:1'
+    ]
+
+# Hardware H.264 encoders in order of preference, with their rate-control settings
+_HW_ENCODER_ARGS = {
+    "h264_nvenc": ["-preset", "p4", "-tune", "hq", "-rc", "vbr", "-cq", "23", "-b:v", "0"],
+    "h264_qsv": ["-global_quality", "23"],
+    "h264_videotoolbox": ["-b:v", "8M"],
+    "h264_vaapi": ["-qp", "23"],
+}
+VAAPI_DEVICE = "/dev/dri/renderD128"
+
+# Subtitle "path" that makes the burn-in read the ASS script from stdin
+SUBTITLE_PIPE = "pipe:0"
+
+# libx264 settings for each encode_quality, used when no hardware encoder works
+_X264_QUALITY_ARGS = {
+    "fast": ["-preset", "veryfast", "-crf", "26"],
+    "balanced": ["-preset", "fast", "-crf", "23"],
+    "archival": ["-preset", "slow", "-crf", "20"],
+}
+
+@functools.lru_cache(maxsize=1)
+def _detect_hw_encoder() -> Optional[str]:
+    """Find a hardware H.264 encoder that actually works on this machine.
+
+    Being compiled into FFmpeg is not enough (e.g. NVENC without an NVIDIA
+    GPU), so each candidate gets a one-frame trial encode. The result is
+    cached for the life of the process.
+
+    Returns:
+        Encoder name, or None if only software encoding is available
+    """
+    compiled = available_encoders()
+    for encoder in _HW_ENCODER_ARGS:
+        if encoder not in compiled:
+            continue
+
+        device_args: List[str] = []
+        upload_args: List[str] = []
+        if encoder == "h264_vaapi":
+            device_args = ["-vaapi_device", VAAPI_DEVICE]
+            upload_args = ["-vf", "format=nv12,hwupload"]
+
+        cmd = [
+            "ffmpeg", "-hide_banner", "-loglevel", "error",
+            *device_args,
+            "-f", "lavfi", "-i", "nullsrc=s=256x256:d=0.1",
+            *upload_args,
+            "-frames:v", "1",
+            "-c:v", encoder,
+            "-f", "null", "-"
+        ]
+        try:
+            subprocess.run(cmd, check=True, capture_output=True, timeout=30)
+        except (OSError, subprocess.CalledProcessError, subprocess.TimeoutExpired):
+            logger.debug(f"{encoder} is compiled in but failed a trial encode")
+            continue
+
+        logger.info(f"Using hardware encoder {encoder}")
+        return encoder
+
+    return None
+
 def extract_audio(video_path: Union[str, Path], output_path: Union[str, Path]) -> None:
     """Extract audio from video file.
 
@@ -19,16 +144,7 @@ def extract_audio(video_path: Union[str, Path], output_path: Union[str, Path]) -
         subprocess.CalledProcessError: If FFmpeg command fails
     """
     try:
-        cmd = [
-            'ffmpeg',
-            '-i', str(video_path),
-            '-vn',  # No video
-            '-acodec', 'aac',
-            '-b:a', '192k',
-            '-y',  # Overwrite output file
-            str(output_path)
-        ]
-
+        cmd = _extract_audio_cmd(video_path, output_path)
         subprocess.run(cmd, check=True, capture_output=True, text=True)
         logger.info("Audio extracted successfully")
 
@@ -36,11 +152,230 @@ def extract_audio(video_path: Union[str, Path], output_path: Union[str, Path]) -
         logger.error(f"FFmpeg audio extraction failed: {e.stderr}")
         raise
 
+async def extract_audio_async(video_path: Union[str, Path], output_path: Union[str, Path]) -> None:
+    """Extract audio from video file without blocking the event loop.
+
+    Args:
+        video_path: Input video file path
+        output_path: Output audio file path
+
+    Raises:
+        subprocess.CalledProcessError: If FFmpeg command fails
+    """
+    try:
+        await _run_async(_extract_audio_cmd(video_path, output_path))
+        logger.info("Audio extracted successfully")
+
+    except subprocess.CalledProcessError as e:
+        logger.error(f"FFmpeg audio extraction failed: {e.stderr}")
+        raise
+
+def _extract_audio_cmd(video_path: Union[str, Path], output_path: Union[str, Path]) -> List[str]:
+    return [
+        'ffmpeg',
+        '-i', str(video_path),
+        '-vn',  # No video
+        '-acodec', 'aac',
+        '-b:a', '192k',
+        '-y',  # Overwrite output file
+        str(output_path)
+    ]
+
+# Per event loop: True -> hardware encoder slots, False -> libx264 slots
+_encode_semaphores: "weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, Dict[bool, asyncio.Semaphore]]" = (
+    weakref.WeakKeyDictionary()
+)
+
+def _encode_semaphore(hardware: bool) -> asyncio.Semaphore:
+    """Get the semaphore that caps concurrent encodes on the running loop.
+
+    A single GPU encoder gains nothing from parallel sessions, so hardware
+    encodes run one at a time; libx264 encodes are capped at the core count.
+    """
+    slots = _encode_semaphores.setdefault(asyncio.get_running_loop(), {})
+    semaphore = slots.get(hardware)
+    if semaphore is None:
+        semaphore = slots[hardware] = asyncio.Semaphore(
+            1 if hardware else (os.cpu_count() or 1)
+        )
+    return semaphore
+
+async def _run_async(cmd: List[str], input: Optional[bytes] = None) -> str:
+    """Run a command as an asyncio subprocess and return its stdout as text.
+
+    Raises:
+        subprocess.CalledProcessError: If the command exits with a non-zero status
+    """
+    stdout = await _run_async_bytes(cmd, input)
+    return stdout.decode(errors="replace")
+
+async def _run_async_bytes(cmd: List[str], input: Optional[bytes] = None) -> bytes:
+    """Run a command as an asyncio subprocess and return its raw stdout.
+
+    Args:
+        cmd: Command and arguments
+        input: Bytes to write to the command's stdin, if any
+
+    Raises:
+        subprocess.CalledProcessError: If the command exits with a non-zero status
+    """
+    process = await asyncio.create_subprocess_exec(
+        *cmd,
+        stdin=asyncio.subprocess.PIPE if input is not None else asyncio.subprocess.DEVNULL,
+        stdout=asyncio.subprocess.PIPE,
+        stderr=asyncio.subprocess.PIPE
+    )
+    stdout, stderr = await process.communicate(input)
+
+    # Always set once communicate() returns
+    returncode = process.returncode
+    if returncode:
+        raise subprocess.CalledProcessError(
+            returncode, cmd, output=stdout, stderr=stderr.decode(errors="replace")
+        )
+    return stdout
+
+def _uses_hw_encoder(cuda: Optional[bool]) -> bool:
+    """Whether a burn-in will encode on a GPU; probes and caches the encoders."""
+    return bool((cuda and "h264_nvenc" in available_encoders()) or _detect_hw_encoder())
+
+def _check_encode_quality(encode_quality: str) -> None:
+    if encode_quality not in _X264_QUALITY_ARGS:
+        raise ValueError(
+            f"Invalid encode_quality {encode_quality!r}, "
+            f"expected one of: {', '.join(_X264_QUALITY_ARGS)}"
+        )
+
+def _encode_settings(encode_quality: str) -> Tuple[List[str], List[str], str, List[str]]:
+    """Pick the encoder for a burn-in outside the cuda pipeline.
+
+    Returns:
+        Tuple of (global args, per-input args, suffix for the subtitle filter,
+        encoder args)
+    """
+    encoder = _detect_hw_encoder()
+
+    if encoder == "h264_vaapi":
+        # Subtitles are drawn on the CPU, then frames are uploaded to the GPU
+        return (
+            ["-vaapi_device", VAAPI_DEVICE],
+            [],
+            ",format=nv12,hwupload",
+            ["-c:v", encoder, *_HW_ENCODER_ARGS[encoder]],
+        )
+    if encoder:
+        # Decode on the GPU where possible
+        return [], ["-hwaccel", "auto"], "", ["-c:v", encoder, *_HW_ENCODER_ARGS[encoder]]
+    return [], [], "", ["-c:v", "libx264", *_X264_QUALITY_ARGS[encode_quality]]
+
+def _combine_video_subtitles_cmd(
+    video_path: Union[str, Path],
+    subtitle_path: Union[str, Path],
+    output_path: Union[str, Path],
+    cuda: Optional[bool] = False,
+    burn_in: bool = True,
+    encode_quality: EncodeQuality = "balanced"
+) -> List[str]:
+    """Build the FFmpeg command that burns ASS subtitles into a video.
+
+    With ``cuda`` the whole pipeline runs on an NVIDIA GPU. Otherwise the
+    first working hardware encoder is used, falling back to libx264.
+    Without ``burn_in`` the subtitles are muxed as a soft track instead.
+    """
+    _check_encode_quality(encode_quality)
+
+    if not burn_in:
+        return _mux_subtitles_cmd(video_path, subtitle_path, output_path)
+
+    font_manager = FontManager()
+    fonts_dir_path = font_manager.font_dir
+    escaped_fonts_dir = str(fonts_dir_path).replace('\\', '/').replace(':', '\\:')
+    escaped_subtitle_path = str(subtitle_path).replace('\\', '/').replace(':', '\\:')
+
+    # libass can't read a pipe itself, the subtitles filter demuxes the ASS
+    # through libavformat first; -nostdin keeps FFmpeg off the piped script
+    piped = str(subtitle_path) == SUBTITLE_PIPE
+    subtitle_filter = "subtitles" if piped else "ass"
+    stdin_args = ["-nostdin"] if piped else []
+
+    if cuda and "h264_nvenc" not in available_encoders():
+        logger.warning("h264_nvenc is not available in this FFmpeg build, falling back to libx264")
+        cuda = False
+
+    if cuda:
+        return [
+            "ffmpeg",
+            *stdin_args,
+            "-hwaccel", "cuda",
+            "-hwaccel_output_format", "cuda",
+            "-i", str(video_path),
+            "-vf", f"hwdownload,format=nv12,{subtitle_filter}={escaped_subtitle_path}:fontsdir={escaped_fonts_dir}",
+            "-c:v", "h264_nvenc",
+            "-preset", "p1",
+            "-rc", "vbr",
+            "-cq", "15",
+            "-b:v", "0",
+            "-maxrate", "10M",
+            "-bufsize", "20M",
+            "-g", "60",
+            "-keyint_min", "60",
+            "-c:a", "copy",
+            "-y",
+            "-loglevel", "error",  # Only show errors
+            str(output_path)
+        ]
+
+    global_args, input_args, upload_filter, encode_args = _encode_settings(encode_quality)
+
+    return [
+        "ffmpeg",
+        *stdin_args,
+        *global_args,
+        *input_args,
+        "-i", str(video_path),
+        "-vf", f"{subtitle_filter}={escaped_subtitle_path}:fontsdir={escaped_fonts_dir}{upload_filter}",
+        *encode_args,
+        "-c:a", "copy",  # Copy audio stream
+        "-movflags", "+faststart",  # Enable fast start for web playback
+        "-y",  # Overwrite output file
+        "-loglevel", "error",  # Only show errors
+        str(output_path)
+    ]
+
+def _mux_subtitles_cmd(
+    video_path: Union[str, Path],
+    subtitle_path: Union[str, Path],
+    output_path: Union[str, Path]
+) -> List[str]:
+    """Build the FFmpeg command that adds ASS subtitles as a soft track.
+
+    Audio and video are stream-copied, so nothing is re-encoded. MP4/MOV
+    only carry mov_text (plain text); Matroska keeps the ASS as is.
+    """
+    subtitle_codec = "copy" if Path(output_path).suffix.lower() == ".mkv" else "mov_text"
+    return [
+        "ffmpeg",
+        "-i", str(video_path),
+        "-i", str(subtitle_path),
+        "-map", "0:v",
+        "-map", "0:a?",
+        "-map", "1:s",
+        "-c", "copy",
+        "-c:s", subtitle_codec,
+        "-metadata:s:s:0", "language=eng",
+        "-movflags", "+faststart",  # Enable fast start for web playback
+        "-y",  # Overwrite output file
+        "-loglevel", "error",  # Only show errors
+        str(output_path)
+    ]
+
 def combine_video_subtitles(
     video_path: Union[str, Path],
     subtitle_path: Union[str, Path],
     output_path: Union[str, Path],
-    cuda: Optional[bool] = False
+    cuda: Optional[bool] = False,
+    burn_in: bool = True,
+    encode_quality: EncodeQuality = "balanced"
 ) -> None:
     """Combine video with ASS subtitles.
 
@@ -48,61 +383,112 @@ def combine_video_subtitles(
         video_path: Input videeo file path
         subtitle_path: ASS subtitle file path
         output_path: Output video file path
+        cuda: Decode and encode on an NVIDIA GPU (falls back to libx264 if NVENC is missing).
+            Without it a working hardware encoder (NVENC, QSV, VideoToolbox, VAAPI)
+            is still used for the encode when one is available.
+        burn_in: Render the subtitles into the frames. If False they are muxed
+            as a soft subtitle track without re-encoding; the bounce animation
+            and colors need burn-in.
+        encode_quality: libx264 speed/size trade-off when no hardware encoder is
+            available: "fast" (veryfast, CRF 26), "balanced" (fast, CRF 23) or
+            "archival" (slow, CRF 20)
 
     Raises:
         subprocess.CalledProcessError: If FFmpeg command fails
+        ValueError: If encode_quality is not a known setting
     """
-    font_manager = FontManager()
-    fonts_dir_path = font_manager.font_dir
-    escaped_fonts_dir = str(fonts_dir_path).replace('\\', '/').replace(':', '\\:')
-    escaped_subtitle_path = str(subtitle_path).replace('\\', '/').replace(':', '\\:')
+    cmd = _combine_video_subtitles_cmd(
+        video_path, subtitle_path, output_path, cuda, burn_in, encode_quality
+    )
+
+    try:
+        subprocess.run(cmd, check=True, capture_output=True, text=True)
+        logger.info("Subtitles combined with video successfully")
+
+    except subprocess.CalledProcessError as e:
+        logger.error(f"FFmpeg subtitle combination failed: {e.stderr}")
+        raise
+
+async def combine_video_subtitles_async(
+    video_path: Union[str, Path],
+    subtitle_path: Union[str, Path],
+    output_path: Union[str, Path],
+    cuda: Optional[bool] = False,
+    burn_in: bool = True,
+    encode_quality: EncodeQuality = "balanced",
+    subtitle_content: Optional[str] = None
+) -> None:
+    """Combine video with ASS subtitles without blocking the event loop.
+
+    Same as ``combine_video_subtitles`` but FFmpeg runs as an asyncio
+    subprocess, so several videos can be encoded concurrently with
+    ``asyncio.gather``. Burn-in encodes are throttled so they don't
+    oversubscribe the GPU encoder or the CPU.
+
+    Args:
+        video_path: Input video file path
+        subtitle_path: ASS subtitle file path
+        output_path: Output video file path
+        cuda: Decode and encode on an NVIDIA GPU (falls back to libx264 if NVENC is missing).
+            Without it a working hardware encoder (NVENC, QSV, VideoToolbox, VAAPI)
+            is still used for the encode when one is available.
+        burn_in: Render the subtitles into the frames. If False they are muxed
+            as a soft subtitle track without re-encoding; the bounce animation
+            and colors need burn-in.
+        encode_quality: libx264 speed/size trade-off when no hardware encoder is
+            available: "fast" (veryfast, CRF 26), "balanced" (fast, CRF 23) or
+            "archival" (slow, CRF 20)
+        subtitle_content: ASS script to pipe to FFmpeg over stdin instead of
+            reading ``subtitle_path``, so no subtitle file has to be written.
+            Burn-in only.
+
+    Raises:
+        subprocess.CalledProcessError: If FFmpeg command fails
+        ValueError: If encode_quality is not a known setting, or subtitle_content
+            is given without burn_in
+    """
+    _check_encode_quality(encode_quality)
+
+    hardware = False
+    if burn_in:
+        # The first call probes FFmpeg (including trial encodes), so resolve the
+        # encoder in a worker thread; building the command then hits the cache
+        loop = asyncio.get_running_loop()
+        hardware = await loop.run_in_executor(None, _uses_hw_encoder, cuda)
 
+    stdin_input = None
+    if subtitle_content is not None:
+        if not burn_in:
+            raise ValueError("subtitle_content can only be piped when burning in")
+        subtitle_path = SUBTITLE_PIPE
+        stdin_input = subtitle_content.encode("utf-8")
+
+    cmd = _combine_video_subtitles_cmd(
+        video_path, subtitle_path, output_path, cuda, burn_in, encode_quality
+    )
 
     try:
-        if cuda:
-            cmd = [
-                "ffmpeg",
-                "-hwaccel", "cuda",
-                "-hwaccel_output_format", "cuda",
-                "-i", str(video_path),
-                "-vf", f"hwdownload,format=nv12,ass={escaped_subtitle_path}:fontsdir={escaped_fonts_dir}",
-                "-c:v", "h264_nvenc",
-                "-preset", "p1",
-                "-rc", "vbr",
-                "-cq", "15",
-                "-b:v", "0",
-                "-maxrate", "10M",
-                "-bufsize", "20M",
-                "-g", "60",
-                "-keyint_min", "60",
-                "-c:a", "copy",
-                "-y",
-                "-loglevel", "error",  # Only show errors
-                output_path
-            ]
+        if burn_in:
+            async with _encode_semaphore(hardware):
+                await _run_async(cmd, stdin_input)
         else:
-            cmd = [
-                "ffmpeg",
-                "-i", str(video_path),
-                "-vf", f"ass={escaped_subtitle_path}:fontsdir={escaped_fonts_dir}",
-                "-c:a", "copy",  # Copy audio stream
-                "-preset", "medium",  # Encoding preset
-                "-movflags", "+faststart",  # Enable fast start for web playback
-                "-y",  # Overwrite output file
-                "-loglevel", "error",  # Only show errors
-                str(output_path)
-            ]
-
-        subprocess.run(cmd, check=True, capture_output=True, text=True)
+            await _run_async(cmd)
         logger.info("Subtitles combined with video successfully")
 
     except subprocess.CalledProcessError as e:
         logger.error(f"FFmpeg subtitle combination failed: {e.stderr}")
         raise
 
+def _probe_key(video_path: Union[str, Path]) -> Tuple[str, int, int]:
+    """Cache key for ffprobe results; a replaced or edited file gets a new key."""
+    stat = os.stat(video_path)
+    return str(video_path), stat.st_mtime_ns, stat.st_size
+
 def get_video_duration(video_path: Union[str, Path]) -> float:
     """Get video duration in seconds.
 
+    Results are cached on the file's path, modification time and size.
+
     Args:
         video_path: Input video file path
 
@@ -112,18 +498,21 @@ def get_video_duration(video_path: Union[str, Path]) -> float:
     Raises:
         subprocess.CalledProcessError: If FFmpeg command fails
     """
+    return _probe_duration(*_probe_key(video_path))
+
+@functools.lru_cache(maxsize=256)
+def _probe_duration(video_path: str, mtime_ns: int, size: int) -> float:
     try:
         cmd = [
             'ffprobe',
             '-v', 'error',
             '-show_entries', 'format=duration',
             '-of', 'default=noprint_wrappers=1:nokey=1',
-            str(video_path)
+            video_path
         ]
 
         result = subprocess.run(cmd, check=True, capture_output=True, text=True)
-        duration = float(result.stdout.strip())
-        return duration
+        return float(result.stdout.strip())
 
     except subprocess.CalledProcessError as e:
         logger.error(f"FFprobe duration check failed: {e.stderr}")
@@ -132,6 +521,9 @@ def get_video_duration(video_path: Union[str, Path]) -> float:
 def get_video_dimensions(video_path: Union[str, Path]) -> Tuple[int, int]:
     """Get video width and height.
 
+    Results are cached on the file's path, modification time and size, so
+    captioning the same video again skips the ffprobe call.
+
     Args:
         video_path: Path to video file
 
@@ -141,6 +533,10 @@ def get_video_dimensions(video_path: Union[str, Path]) -> Tuple[int, int]:
     Raises:
         subprocess.CalledProcessError: If FFmpeg command fails
     """
+    return _probe_dimensions(*_probe_key(video_path))
+
+@functools.lru_cache(maxsize=256)
+def _probe_dimensions(video_path: str, mtime_ns: int, size: int) -> Tuple[int, int]:
     try:
         cmd = [
             'ffprobe',
@@ -148,7 +544,7 @@ def get_video_dimensions(video_path: Union[str, Path]) -> Tuple[int, int]:
             '-select_streams', 'v:0',
             '-show_entries', 'stream=width,height',
             '-of', 'csv=s=x:p=0',
-            str(video_path)
+            video_path
         ]
 
         result = subprocess.run(cmd, check=True, capture_output=True, text=True)
@@ -1,9 +1,10 @@
 """Subtitle format utilities and conversions."""
 
+import functools
 import logging
 import re
 from pathlib import Path
-from typing import List, Optional, Union
+from typing import Dict, Iterator, List, Optional, Tuple, Union
 
 import pysrt  # type: ignore[import-untyped]
 
@@ -13,19 +14,248 @@ from ..utils.ffmpeg import get_video_dimensions
 
 logger = logging.getLogger(__name__)
 
+# Patterns used once per subtitle, compiled up front. Speaker labels are
+# always ASCII, so skip the Unicode class checks.
+_SPEAKER_LABEL_RE = re.compile(r"^(Speaker [A-Z]+):\s*(.*)", re.ASCII)
+_SPEAKER_PREFIX_RE = re.compile(r"^(Speaker [A-Z]+):\s*", re.ASCII)
+
+# One SRT cue exactly as pysrt would print it: index, zero-padded timings and
+# one or more text lines without trailing whitespace, followed by a blank line
+_SRT_TIME = r"(?:[0-9]{2}|[1-9][0-9]{2,}):[0-5][0-9]:[0-5][0-9],[0-9]{3}"
+_SRT_TEXT_LINE = r"[^\n\r\v\f\x1c-\x1e\x85\u2028\u2029]*\S"
+_CUE_RE = re.compile(
+    rf"(0|[1-9][0-9]*)\n({_SRT_TIME}) --> ({_SRT_TIME})\n"
+    rf"({_SRT_TEXT_LINE}(?:\n{_SRT_TEXT_LINE})*)(?:\n\n|\n?\Z)"
+)
+
+# HTML-style tags (<font ...>, <I>, <br/>, ...); a "<" not followed by a tag
+# name, as in "I <3 you" or "a < b", is caption text
+_FORMAT_TAG_RE = re.compile(r"</?[a-z][^>]*>", re.IGNORECASE)
+_FONT_COLOR_RE = re.compile(r'<font[^>]*\scolor=(?:"([^"]+)"|([^\s">]+))', re.IGNORECASE)
+
+# Punctuation that ends a caption line in group_words_into_lines
+_SENT_END = frozenset(".!?:;")
+
+# ASS timestamps are H:MM:SS.cc (centiseconds)
+_ASS_TIME_FMT = "%d:%02d:%02d.%02d"
+
+# Scale transition between two bounce keyframes: \t(start_ms,end_ms,\fscxN\fscyN)
+_KEYFRAME_TAG = "{{\\t({},{},\\fscx{:.0f}\\fscy{:.0f})}}".format
+
+
+def _srt_time_ms(stamp: str) -> int:
+    """Convert an SRT timestamp (HH:MM:SS,mmm) to milliseconds."""
+    parts = stamp.replace(",", ":").replace(".", ":").split(":")
+    if len(parts) != 4:
+        raise ValueError(f"Invalid SRT timestamp: {stamp!r}")
+    hours, minutes, seconds, millis = map(int, parts)
+    return ((hours * 60 + minutes) * 60 + seconds) * 1000 + millis
+
+
+def _cue_time_ms(stamp: str) -> int:
+    """Convert a timestamp already validated by _SRT_TIME to milliseconds."""
+    return (
+        int(stamp[:-10]) * 3600000
+        + int(stamp[-9:-7]) * 60000
+        + int(stamp[-6:-4]) * 1000
+        + int(stamp[-3:])
+    )
+
+
+def _parse_srt(content: str) -> Iterator[Tuple[int, int, str]]:
+    """Yield (start_ms, end_ms, text) for each cue in SRT content.
+
+    A lightweight replacement for pysrt.from_string when only timings and
+    text are needed. Like pysrt, cues are separated by blank lines, the index
+    line is optional, CRLF line endings are accepted and malformed cues are
+    skipped.
+    """
+    # SRT we wrote ourselves is always canonical, so match it with a single
+    # regex scan and only fall back to the line parser if a gap is left over
+    cues: List[Tuple[int, int, str]] = []
+    consumed = 0
+    for match in _CUE_RE.finditer(content):
+        if match.start() != consumed:
+            break
+        cues.append(
+            (_cue_time_ms(match[2]), _cue_time_ms(match[3]), match[4])
+        )
+        consumed = match.end()
+    if consumed == len(content):
+        yield from cues
+        return
+
+    block: List[str] = []
+    for line in content.splitlines() + [""]:
+        line = line.rstrip()
+        if line:
+            block.append(line)
+            continue
+        if not block:
+            continue
+
+        lines, block = block, []
+        if len(lines) < 2:
+            continue
+        if "-->" not in lines[0]:
+            lines = lines[1:]  # drop the index line
+        timing = lines[0].split("-->")
+        if len(timing) != 2:
+            continue
+        try:
+            start = _srt_time_ms(timing[0].strip())
+            end = _srt_time_ms(timing[1].lstrip().split(" ", 1)[0])
+        except ValueError:
+            continue
+        yield start, end, "\n".join(lines[1:])
+
+
+def _ass_time(ms: int) -> str:
+    """Format a millisecond offset as an ASS timestamp."""
+    seconds, ms = divmod(ms, 1000)
+    minutes, seconds = divmod(seconds, 60)
+    hours, minutes = divmod(minutes, 60)
+    return _ASS_TIME_FMT % (hours, minutes, seconds, ms // 10)
+
+
+def _to_ass_text(text: str) -> Tuple[str, Optional[str]]:
+    """Convert cue text to ASS dialogue text.
+
+    HTML-style tags (<font ...>, <b>, <I>, <br>, ...) are removed, keeping
+    their content, and line breaks become ASS ``\\N`` breaks. A ``<`` that
+    doesn't start a tag is caption text (e.g. "I <3 you") and is kept. The
+    color of the first <font color="..."> tag is picked up on the way.
 
+    Returns:
+        Tuple of (ASS text, font color or None)
+    """
+    if "<" in text:
+        color_match = _FONT_COLOR_RE.search(text)
+        text = _FORMAT_TAG_RE.sub("", text)
+        color = (color_match[1] or color_match[2]) if color_match else None
+    else:
+        color = None
+    return text.replace("\n", "\\N"), color
+
+
+_BASE_COLORS = {
+    "white": "&HFFFFFF&",
+    "yellow": "&H00FFFF&",
+    "red": "&H0000FF&",
+    "blue": "&HFF0000&",
+    "green": "&H00FF00&",
+    "purple": "&H800080&",
+    "black": "&H000000&",
+}
+
+# Also keyed by the usual "Red" / "RED" spellings so those skip the lower()
+_COLOR_MAP = {
+    **_BASE_COLORS,
+    **{name.title(): code for name, code in _BASE_COLORS.items()},
+    **{name.upper(): code for name, code in _BASE_COLORS.items()},
+}
+
+
+@functools.lru_cache(maxsize=64)
 def color_to_ass(color: str) -> str:
     """Convert common color names to ASS color codes."""
-    color_map = {
-        "white": "&HFFFFFF&",
-        "yellow": "&H00FFFF&",
-        "red": "&H0000FF&",
-        "blue": "&HFF0000&",
-        "green": "&H00FF00&",
-        "purple": "&H800080&",
-        "black": "&H000000&",
-    }
-    return color_map.get(color.lower(), "&HFFFFFF&")
+    return _COLOR_MAP.get(color) or _COLOR_MAP.get(color.lower(), "&HFFFFFF&")
+
+
+# Script info, the Default style and the events header; only the fields in
+# braces change between videos
+_ASS_HEADER_TEMPLATE = (
+    "[Script Info]\n"
+    "ScriptType: v4.00+\n"
+    "PlayResX: {width}\n"
+    "PlayResY: {height}\n"
+    "ScaledBorderAndShadow: yes\n\n"
+    # Style section
+    "[V4+ Styles]\n"
+    "Format: Name, Fontname, Fontsize, PrimaryColour, SecondaryColour, OutlineColour, BackColour, Bold, Italic, Underline, StrikeOut, ScaleX, ScaleY, Spacing, Angle, BorderStyle, Outline, Shadow, Alignment, MarginL, MarginR, MarginV, Encoding\n"
+    "Style: Default,{font},{font_size},"  # Use font_size from StyleConfig
+    "{color},"  # Primary color
+    "&H000000FF,"  # Secondary color
+    "{outline_color},"  # Outline color
+    "&H00000000,"  # Background color
+    "0,0,0,0,"  # No bold, italic, underline, strikeout
+    "100,100,0,0,1,"  # Default scaling and spacing
+    "{outline_thickness},0,"  # Outline thickness, no shadow
+    "2,10,10,{margin_v},1\n\n"  # Alignment and margins
+    # Events section
+    "[Events]\n"
+    "Format: Layer, Start, End, Style, Name, MarginL, MarginR, MarginV, Effect, Text\n"
+)
+
+
+@functools.lru_cache(maxsize=64)
+def _build_ass_header(
+    width: int,
+    height: int,
+    font: Optional[str],
+    font_size: int,
+    color: str,
+    outline_color: str,
+    outline_thickness: int,
+    margin_v: int,
+) -> str:
+    """Build the ASS script info, style and events header.
+
+    Batch runs reuse the same style and resolution for every video, so the
+    assembled header is cached on its inputs.
+    """
+    return _ASS_HEADER_TEMPLATE.format(
+        width=width,
+        height=height,
+        font=font,
+        font_size=font_size,
+        color=color_to_ass(color),
+        outline_color=color_to_ass(outline_color),
+        outline_thickness=outline_thickness,
+        margin_v=margin_v,
+    )
+
+
+@functools.lru_cache(maxsize=512)
+def _bounce_prefix(
+    duration_ms: int,
+    num_keyframes: int,
+    target_scale: float,
+    auto_scale_font: bool,
+) -> str:
+    """Build the bounce animation tags for a cue.
+
+    Word-level cues share a handful of durations, so the tags are cached on
+    the exact cue duration and scale rather than rebuilt for every line.
+    """
+    duration = duration_ms // 1000 + (duration_ms % 1000) / 1000
+
+    if auto_scale_font:
+        tags = ["{\\fscx100\\fscy100}"]
+    else:
+        tags = [f"{{\\fscx{target_scale:.0f}\\fscy{target_scale:.0f}}}"]
+
+    # Scale falls linearly from 100% to target_scale; at keyframe j,
+    # t / duration is simply j / (num_keyframes - 1)
+    inv_n1 = 1.0 / (num_keyframes - 1)
+    scale_range = 100 - target_scale
+
+    # Set initial scale as starting point (no flicker)
+    tags.append("{\\fscx100\\fscy100}")
+
+    # Add smooth transitions between keyframes using proper time ranges
+    t_start_ms = 0
+    for j in range(1, num_keyframes):
+        # Convert to milliseconds for ASS \t() tag; each range
+        # starts where the previous one ended
+        t_end_ms = int(j * duration / (num_keyframes - 1) * 1000)
+        end_scale = 100 - scale_range * (j * inv_n1)
+        if end_scale < target_scale:
+            end_scale = target_scale
+        tags.append(_KEYFRAME_TAG(t_start_ms, t_end_ms, end_scale, end_scale))
+        t_start_ms = t_end_ms
+
+    return "".join(tags)
 
 
 def create_ass_subtitles(
@@ -36,159 +266,110 @@ def create_ass_subtitles(
     animation: AnimationConfig,
 ) -> None:
     """Create ASS subtitle file from SRT content with styling."""
+    ass_content = render_ass_subtitles(srt_content, video_path, style, animation)
+    Path(output_path).write_text(ass_content, encoding="utf-8")
+
+    logger.info(f"ASS subtitles created successfully at: {output_path}")
+
+
+def render_ass_subtitles(
+    srt_content: str,
+    video_path: Union[str, Path],
+    style: StyleConfig,
+    animation: AnimationConfig,
+) -> str:
+    """Convert SRT content to styled ASS subtitles in memory.
+
+    Same as ``create_ass_subtitles`` but returns the ASS text instead of
+    writing it, e.g. to pipe it straight into FFmpeg.
+    """
     try:
         # Get video dimensions
         width, height = get_video_dimensions(video_path)
         font_manager = FontManager()
         font = font_manager.get_font_mapping(style.font)
 
-        with open(output_path, "w", encoding="utf-8") as f:
-            # Write ASS header
-            f.write("[Script Info]\n")
-            f.write("ScriptType: v4.00+\n")
-            f.write(f"PlayResX: {width}\n")
-            f.write(f"PlayResY: {height}\n")
-            f.write("ScaledBorderAndShadow: yes\n\n")
-
-            # Write style section
-            f.write("[V4+ Styles]\n")
-            f.write(
-                "Format: Name, Fontname, Fontsize, PrimaryColour, SecondaryColour, OutlineColour, BackColour, Bold, Italic, Underline, StrikeOut, ScaleX, ScaleY, Spacing, Angle, BorderStyle, Outline, Shadow, Alignment, MarginL, MarginR, MarginV, Encoding\n"
-            )
-
-            margin_v = int(
-                height * (1 - style.verticle_position)
-            )  # Convert relative position to pixels
-
-            # Write default style
-            f.write(
-                f"Style: Default,{font},{style.font_size},"  # Use font_size from StyleConfig
-                f"{color_to_ass(style.color)},"  # Primary color
-                f"&H000000FF,"  # Secondary color
-                f"{color_to_ass(style.outline_color)},"  # Outline color
-                f"&H00000000,"  # Background color
-                f"0,0,0,0,"  # No bold, italic, underline, strikeout
-                f"100,100,0,0,1,"  # Default scaling and spacing
-                f"{style.outline_thickness},0,"  # Outline thickness, no shadow
-                f"2,10,10,{margin_v},1\n\n"  # Alignment and margins
-            )
-
-            # Write events section
-            f.write("[Events]\n")
-            f.write(
-                "Format: Layer, Start, End, Style, Name, MarginL, MarginR, MarginV, Effect, Text\n"
+        margin_v = int(
+            height * (1 - style.verticle_position)
+        )  # Convert relative position to pixels
+
+        # Collect the whole file and write it in one go
+        parts = [
+            _build_ass_header(
+                width,
+                height,
+                font,
+                style.font_size,
+                style.color,
+                style.outline_color,
+                style.outline_thickness,
+                margin_v,
             )
-
-            # Convert SRT to ASS events
-            subs = pysrt.from_string(srt_content)
-
-            for i, sub in enumerate(subs, 1):
-                try:
-                    start = f"{sub.start.hours:01d}:{sub.start.minutes:02d}:{sub.start.seconds:02d}.{sub.start.milliseconds // 10:02d}"
-                    end = f"{sub.end.hours:01d}:{sub.end.minutes:02d}:{sub.end.seconds:02d}.{sub.end.milliseconds // 10:02d}"
-
-                    # Process text - keep any speaker labels but remove font tags
-                    text = sub.text
-
-                    # Extract color information from font tags if present
-                    color_match = re.search(r'<font[^>]*\scolor="([^"]+)"', text)
-                    color = color_match.group(1) if color_match else style.color
-
-                    # Remove font tags but keep the content
-                    text = re.sub(r"<font[^>]*>", "", text)
-                    text = re.sub(r"</font>", "", text)
-                    text = re.sub(
-                        r"<[^>]+>", "", text
-                    )  # Remove any other HTML-style tags
-                    text = text.replace("\n", "\\N")
-
-                    # Apply color override if different from default
-                    if color.lower() != style.color.lower():
-                        text = f"{{\\c{color_to_ass(color)}}}{text}"
-
-                    # Calculate final scale (for longer text)
-                    if style.auto_scale_font:
-                        # Calculate a scaling factor based on text length
-                        char_count = len(text.replace("\\N", ""))
-                        if char_count > 3:  # Only scale if more than 5 characters
-                            # Scale down to 70% for long text (20+ chars)
-                            final_scale = max(70, 100 - ((char_count - 3) * 2.5))
-                        else:
-                            final_scale = 100
-                    else:
-                        # If auto-scaling is disabled, use a fixed final scale
-                        final_scale = 70  # Default to 70% for the animation effect
-
-                    # Apply animation if enabled
-                    if (
-                        animation.enabled and animation.type == "bounce"
-                    ):  # Keep param name for compatibility
-                        duration = (
-                            sub.duration.seconds + sub.duration.milliseconds / 1000
-                        )
-
-                        # Create keyframes for the animation
-                        num_keyframes = (
-                            animation.keyframes if animation.keyframes > 1 else 10
-                        )
-
-                        # Start with color override if different from default
-                        if color.lower() != style.color.lower():
-                            animated_text = f"{{\\c{color_to_ass(color)}}}"
-                        else:
-                            animated_text = ""
-
-                        # Calculate the target end scale (combining animation effect with text length scaling)
-                        if style.auto_scale_font:
-                            animated_text += "{\\fscx100\\fscy100}"
-                            target_scale = final_scale
-                        else:
-                            target_scale = 80
-                            animated_text += (
-                                f"{{\\fscx{target_scale:.0f}\\fscy{target_scale:.0f}}}"
-                            )
-
-                        # # Add keyframe animations throughout the duration
-                        # for j in range(num_keyframes):
-                        #     t = j * duration / (num_keyframes - 1)
-                        #     # Blend from 100% to target_scale
-                        #     scale = max(target_scale, 100 - 90 * (t / duration))
-                        #     animated_text += f"{{\\t({t:.2f},{t:.2f},\\fscx{scale:.0f}\\fscy{scale:.0f})}}"
-
-                        # Calculate scale at each keyframe time
-                        def scale_at(t, dur):
-                            return max(
-                                target_scale, 100 - (100 - target_scale) * (t / dur)
-                            )
-
-                        # Set initial scale as starting point (no flicker)
-                        start_scale = scale_at(0, duration)
-                        animated_text += (
-                            f"{{\\fscx{start_scale:.0f}\\fscy{start_scale:.0f}}}"
-                        )
-
-                        # Add smooth transitions between keyframes using proper time ranges
-                        for j in range(1, num_keyframes):
-                            t_start = (j - 1) * duration / (num_keyframes - 1)
-                            t_end = j * duration / (num_keyframes - 1)
-                            end_scale = scale_at(t_end, duration)
-                            # Convert to milliseconds for ASS \t() tag
-                            t_start_ms = int(t_start * 1000)
-                            t_end_ms = int(t_end * 1000)
-                            animated_text += f"{{\\t({t_start_ms},{t_end_ms},\\fscx{end_scale:.0f}\\fscy{end_scale:.0f})}}"
-
-                        animated_text += text
-                        text = animated_text
-                    elif style.auto_scale_font:
-                        # If animation is disabled but we still need to scale the text for length
-                        text = f"{{\\fscx{final_scale}\\fscy{final_scale}}}{text}"
-
-                    f.write(f"Dialogue: 0,{start},{end},Default,,0,0,0,,{text}\n")
-                except Exception as e:
-                    logger.error(f"Error processing subtitle {i}: {str(e)}")
-                    continue
-
-        logger.info(f"ASS subtitles created successfully at: {output_path}")
+        ]
+
+        # Convert SRT to ASS events
+        subs = _parse_srt(srt_content)
+
+        style_color = style.color.lower()
+        to_ass = color_to_ass
+        animate = animation.enabled and animation.type == "bounce"
+
+        for i, (start_ms, end_ms, text) in enumerate(subs, 1):
+            try:
+                start = _ass_time(start_ms)
+                end = _ass_time(end_ms)
+
+                # Process text - keep any speaker labels but remove font tags
+                # (converting line breaks to \N), picking up the font color
+                text, color = _to_ass_text(text)
+                if color is None:
+                    color = style.color
+
+                # Apply color override if different from default
+                color_tag = ""
+                if color != style.color and color.lower() != style_color:
+                    color_tag = f"{{\\c{to_ass(color)}}}"
+                    text = color_tag + text
+
+                # Calculate final scale (for longer text)
+                if style.auto_scale_font:
+                    # Scale down 2.5% per character beyond 3, clamped to 70-100%
+                    char_count = len(text.replace("\\N", ""))
+                    final_scale = min(100, max(70, 100 - ((char_count - 3) * 2.5)))
+                else:
+                    # If auto-scaling is disabled, use a fixed final scale
+                    final_scale = 70  # Default to 70% for the animation effect
+
+                # Apply animation if enabled
+                if animate:  # Keep param name for compatibility
+                    duration_ms = end_ms - start_ms
+
+                    # Create keyframes for the animation
+                    num_keyframes = (
+                        animation.keyframes if animation.keyframes > 1 else 10
+                    )
+
+                    # Start with color override if different from default
+                    animated_text = color_tag
+
+                    # Calculate the target end scale (combining animation effect with text length scaling)
+                    target_scale = final_scale if style.auto_scale_font else 80
+
+                    animated_text += _bounce_prefix(
+                        duration_ms, num_keyframes, target_scale, style.auto_scale_font
+                    )
+                    animated_text += text
+                    text = animated_text
+                elif style.auto_scale_font:
+                    # If animation is disabled but we still need to scale the text for length
+                    text = f"{{\\fscx{final_scale}\\fscy{final_scale}}}{text}"
+
+                parts.append(f"Dialogue: 0,{start},{end},Default,,0,0,0,,{text}\n")
+            except Exception as e:
+                logger.error(f"Error processing subtitle {i}: {str(e)}")
+                continue
+
+        return "".join(parts)
 
     except Exception as e:
         logger.error(f"Error creating ASS subtitles: {str(e)}")
@@ -219,6 +400,32 @@ def style_srt_content(
     if colors is None:
         colors = ["white", "yellow", "red"]
 
+    # Track speakers and their assigned colors
+    speaker_colors: Dict[str, str] = {}
+
+    if max_words_per_line <= 1:
+        # Fast path: restyle each cue in place with a single regex pass
+        content = srt_content.replace("\r\n", "\n")
+        consumed = 0
+
+        def _restyle(match: "re.Match[str]") -> str:
+            nonlocal consumed
+            if match.start() == consumed:
+                consumed = match.end()
+            index, start, end, text = match.groups()
+            text = _style_cue_text(
+                text, colors, speaker_colors, encode_speaker_colors, keep_speaker_labels, font
+            )
+            return f"{index}\n{start} --> {end}\n{text}\n\n"
+
+        styled_content = _CUE_RE.sub(_restyle, content)
+        if consumed == len(content):
+            return styled_content
+
+        # Not in the canonical layout (extra blank lines, trailing whitespace,
+        # missing indices...): let pysrt normalise it below
+        speaker_colors.clear()
+
     # Parse the SRT content
     subs = pysrt.from_string(srt_content)
 
@@ -226,70 +433,62 @@ def style_srt_content(
         # Process subtitles by speaker to potentially combine them
         subs = _optimize_subtitles_for_max_words(subs, max_words_per_line)
 
-    styled_content = ""
+    parts: List[str] = []
 
-    # Track speakers and their assigned colors
-    speaker_colors = {}
-    subtitle_to_speaker = {}  # Map subtitle indices to speakers
+    for sub in subs:
+        text = _style_cue_text(
+            sub.text, colors, speaker_colors, encode_speaker_colors, keep_speaker_labels, font
+        )
 
-    # First pass: Identify all speakers and assign colors
-    for i, sub in enumerate(subs):
-        text = sub.text
-        speaker_match = re.match(r"^(Speaker [A-Z]+):\s*(.*)", text)
-
-        if speaker_match:
-            speaker_label = speaker_match.group(1)
-            if speaker_label not in speaker_colors:
-                speaker_colors[speaker_label] = colors[
-                    len(speaker_colors) % len(colors)
-                ]
-            # Store which speaker this subtitle belongs to
-            subtitle_to_speaker[i] = speaker_label
-
-    # Second pass: Apply colors and format text
-    for i, sub in enumerate(subs):
-        text = sub.text
-        speaker_label = ""
-        speaker_match = re.match(r"^(Speaker [A-Z]+):\s*(.*)", text)
+        # Write the cue directly in SubRipItem's layout
+        parts.append(f"{sub.index}\n{sub.start} --> {sub.end}\n{text}\n\n")
+
+    return "".join(parts)
 
-        if speaker_match:
-            speaker_label = speaker_match.group(1)
-            text = speaker_match.group(2)
 
-            # Get the color assigned to this speaker
-            color = speaker_colors.get(speaker_label, colors[0])
+def _style_cue_text(
+    text: str,
+    colors: List[str],
+    speaker_colors: Dict[str, str],
+    encode_speaker_colors: bool,
+    keep_speaker_labels: bool,
+    font: Optional[str],
+) -> str:
+    """Apply speaker color and label styling to the text of a single cue.
+
+    Speakers are assigned the next color from ``colors`` the first time they
+    are seen; cues without a speaker label use the first color.
+    """
+    speaker_label = ""
+    color = colors[0]
+    speaker_match = _SPEAKER_LABEL_RE.match(text)
+
+    if speaker_match:
+        speaker_label = speaker_match.group(1)
+        text = speaker_match.group(2)
+
+        # Get the color assigned to this speaker
+        if speaker_label not in speaker_colors:
+            speaker_colors[speaker_label] = colors[len(speaker_colors) % len(colors)]
+        color = speaker_colors[speaker_label]
+
+    # Apply color formatting if enabled
+    if encode_speaker_colors:
+        if font:
+            text = f'<font face="{font}" color="{color}">{text}</font>'
         else:
-            # If no speaker label in this subtitle, see if we know which speaker it belongs to
-            speaker_label = subtitle_to_speaker.get(i)
-            if speaker_label and speaker_label in speaker_colors:
-                color = speaker_colors[speaker_label]
-            else:
-                # Default to first color if we can't determine the speaker
-                color = colors[0]
-
-        # Apply color formatting if enabled
-        if encode_speaker_colors:
-            if font:
-                text = f'<font face="{font}" color="{color}">{text}</font>'
-            else:
-                text = f'<font color="{color}">{text}</font>'
-            # text = f'<font color="{color}">{text}</font>'
-
-        # Add speaker label back only if requested
-        if keep_speaker_labels and speaker_label:
-            text = f"{speaker_label}: {text}"
-
-        # Create a new subtitle with the styled text
-        new_sub = pysrt.SubRipItem(
-            index=sub.index, start=sub.start, end=sub.end, text=text
-        )
+            text = f'<font color="{color}">{text}</font>'
 
-        styled_content += str(new_sub) + "\n"
+    # Add speaker label back only if requested
+    if keep_speaker_labels and speaker_label:
+        text = f"{speaker_label}: {text}"
 
-    return styled_content
+    return text
 
 
-def _optimize_subtitles_for_max_words(subs, max_words_per_line: int):
+def _optimize_subtitles_for_max_words(
+    subs: "pysrt.SubRipFile", max_words_per_line: int
+) -> List["pysrt.SubRipItem"]:
     """Optimize subtitle segmentation based on max_words_per_line.
 
     This function looks at adjacent subtitles from the same speaker and combines them
@@ -303,23 +502,20 @@ def _optimize_subtitles_for_max_words(subs, max_words_per_line: int):
         Optimized list of subtitles
     """
     if not subs or len(subs) <= 1:
-        return subs
+        return list(subs)
 
-    result = []
-    current_batch = []
-    current_speaker = None
+    result: List[pysrt.SubRipItem] = []
+    current_batch: List[pysrt.SubRipItem] = []
+    current_speaker: Optional[str] = None
     current_word_count = 0
 
-    # Helper to create a new subtitle from a batch
-    def create_subtitle_from_batch(batch):
-        if not batch:
-            return None
-
+    # Helper to create a new subtitle from a (non-empty) batch
+    def create_subtitle_from_batch(batch: List[pysrt.SubRipItem]) -> pysrt.SubRipItem:
         combined_text = " ".join(
-            [re.sub(r"^(Speaker [A-Z]+):\s*", "", sub.text) for sub in batch]
+            [_SPEAKER_PREFIX_RE.sub("", sub.text) for sub in batch]
         )
         # Keep the speaker label from the first subtitle
-        first_sub_match = re.match(r"^(Speaker [A-Z]+):\s*", batch[0].text)
+        first_sub_match = _SPEAKER_PREFIX_RE.match(batch[0].text)
         if first_sub_match:
             speaker_prefix = first_sub_match.group(1) + ": "
             combined_text = speaker_prefix + combined_text
@@ -334,9 +530,9 @@ def _optimize_subtitles_for_max_words(subs, max_words_per_line: int):
 
     for i, sub in enumerate(subs):
         # Extract speaker and text
-        speaker_match = re.match(r"^(Speaker [A-Z]+):\s*", sub.text)
+        speaker_match = _SPEAKER_PREFIX_RE.match(sub.text)
         current_sub_speaker = speaker_match.group(1) if speaker_match else None
-        text_without_speaker = re.sub(r"^(Speaker [A-Z]+):\s*", "", sub.text)
+        text_without_speaker = _SPEAKER_PREFIX_RE.sub("", sub.text)
         word_count = len(text_without_speaker.split())
 
         # If we're starting a new batch or changing speakers
@@ -399,8 +595,8 @@ def group_words_into_lines(
     if max_words_per_line <= 0:
         max_words_per_line = 1
 
-    lines = []
-    current_line = []
+    lines: List[str] = []
+    current_line: List[str] = []
     word_count = 0
 
     for word in words:
@@ -409,9 +605,7 @@ def group_words_into_lines(
 
         # Check if we need to start a new line
         if word_count >= max_words_per_line or (
-            respect_punctuation
-            and word.rstrip()[-1] in [".", "!", "?", ":", ";"]
-            and word_count > 0
+            respect_punctuation and word.rstrip()[-1:] in _SENT_END
         ):
             lines.append(" ".join(current_line))
             current_line = []
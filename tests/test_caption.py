@@ -0,0 +1,67 @@
+"""Tests for the functional captioning API."""
+
+import asyncio
+from pathlib import Path
+
+import pytest
+
+from beautiful_captions import Video, batch_process
+
+
+@pytest.fixture
+def videos(tmp_path):
+    paths = []
+    for i in range(6):
+        path = tmp_path / f"clip{i}.mp4"
+        path.touch()
+        paths.append(path)
+    return paths
+
+
+@pytest.fixture
+def fake_captioning(monkeypatch):
+    """Replace transcription and encoding; record how many videos overlap."""
+    state = {"active": 0, "peak": 0}
+
+    async def transcribe(self, service, api_key=None, max_speakers=3):
+        self._srt_content = ""
+
+    async def add_captions_async(self, output_path=None, cuda=False, **kwargs):
+        state["active"] += 1
+        state["peak"] = max(state["peak"], state["active"])
+        # Later clips finish first, so the results must be reordered
+        await asyncio.sleep(0.01 * (10 - int(self.video_path.stem[-1])))
+        state["active"] -= 1
+        return self.video_path.with_stem(f"{self.video_path.stem}_captioned")
+
+    monkeypatch.setattr(Video, "transcribe", transcribe)
+    monkeypatch.setattr(Video, "add_captions_async", add_captions_async)
+    return state
+
+
+def test_batch_process_keeps_order_and_bounds_concurrency(videos, fake_captioning):
+    outputs = asyncio.run(
+        batch_process(videos, concurrency=2, transcribe_with="assemblyai", api_key="key")
+    )
+
+    assert outputs == [p.with_stem(f"{p.stem}_captioned") for p in videos]
+    assert fake_captioning["peak"] == 2
+
+
+def test_batch_process_with_no_videos(fake_captioning):
+    outputs = asyncio.run(batch_process([], transcribe_with="assemblyai", api_key="key"))
+
+    assert outputs == []
+
+
+@pytest.mark.parametrize(
+    "kwargs",
+    [
+        {"concurrency": 0},
+        {"output_path": Path("out.mp4")},
+        {"srt_output_path": Path("out.srt")},
+    ],
+)
+def test_batch_process_rejects_invalid_arguments(videos, kwargs):
+    with pytest.raises(ValueError):
+        asyncio.run(batch_process(videos, transcribe_with="assemblyai", api_key="key", **kwargs))
@@ -0,0 +1,73 @@
+"""Tests for the FFmpeg command builders."""
+
+import pytest
+
+from beautiful_captions.utils import ffmpeg
+from beautiful_captions.utils.ffmpeg import (
+    _combine_video_subtitles_cmd,
+    _encode_settings,
+    _mux_subtitles_cmd,
+)
+
+
+def _option(cmd, flag):
+    return cmd[cmd.index(flag) + 1]
+
+
+@pytest.mark.parametrize(
+    "output_path, codec",
+    [("out.mp4", "mov_text"), ("out.mov", "mov_text"), ("out.mkv", "copy"), ("OUT.MKV", "copy")],
+)
+def test_soft_subtitle_codec_follows_container(output_path, codec):
+    cmd = _mux_subtitles_cmd("in.mp4", "in.ass", output_path)
+
+    assert _option(cmd, "-c:s") == codec
+    # Audio and video are stream-copied, nothing is re-encoded
+    assert _option(cmd, "-c") == "copy"
+    assert "-vf" not in cmd
+    assert cmd[-1] == output_path
+
+
+def test_combine_without_burn_in_muxes():
+    cmd = _combine_video_subtitles_cmd("in.mp4", "in.ass", "out.mkv", burn_in=False)
+
+    assert cmd == _mux_subtitles_cmd("in.mp4", "in.ass", "out.mkv")
+
+
+@pytest.mark.parametrize(
+    "encode_quality, preset, crf",
+    [("fast", "veryfast", "26"), ("balanced", "fast", "23"), ("archival", "slow", "20")],
+)
+def test_encode_settings_use_libx264_without_hardware(monkeypatch, encode_quality, preset, crf):
+    monkeypatch.setattr(ffmpeg, "_detect_hw_encoder", lambda: None)
+
+    global_args, input_args, upload_filter, encode_args = _encode_settings(encode_quality)
+
+    assert (global_args, input_args, upload_filter) == ([], [], "")
+    assert encode_args == ["-c:v", "libx264", "-preset", preset, "-crf", crf]
+
+
+def test_encode_settings_prefer_hardware(monkeypatch):
+    monkeypatch.setattr(ffmpeg, "_detect_hw_encoder", lambda: "h264_nvenc")
+
+    _, input_args, upload_filter, encode_args = _encode_settings("archival")
+
+    assert input_args == ["-hwaccel", "auto"]
+    assert upload_filter == ""
+    assert encode_args[:2] == ["-c:v", "h264_nvenc"]
+
+
+def test_encode_settings_upload_frames_for_vaapi(monkeypatch):
+    monkeypatch.setattr(ffmpeg, "_detect_hw_encoder", lambda: "h264_vaapi")
+
+    global_args, _, upload_filter, encode_args = _encode_settings("balanced")
+
+    assert global_args == ["-vaapi_device", ffmpeg.VAAPI_DEVICE]
+    assert upload_filter == ",format=nv12,hwupload"
+    assert encode_args[:2] == ["-c:v", "h264_vaapi"]
+
+
+@pytest.mark.parametrize("burn_in", [True, False])
+def test_unknown_encode_quality_is_rejected(burn_in):
+    with pytest.raises(ValueError, match="encode_quality"):
+        _combine_video_subtitles_cmd("in.mp4", "in.ass", "out.mp4", burn_in=burn_in, encode_quality="best")
@@ -0,0 +1,60 @@
+"""Tests for SRT to ASS conversion."""
+
+import pytest
+
+from beautiful_captions import AnimationConfig, StyleConfig, style_srt_content
+from beautiful_captions.utils import subtitles
+from beautiful_captions.utils.subtitles import color_to_ass, render_ass_subtitles
+
+
+# No per-cue scale tags, so the dialogue text can be compared directly
+PLAIN_STYLE = StyleConfig(auto_scale_font=False)
+
+
+@pytest.fixture(autouse=True)
+def fake_probe(monkeypatch):
+    """Skip ffprobe; the dimensions only affect the ASS header."""
+    monkeypatch.setattr(subtitles, "get_video_dimensions", lambda path: (1080, 1920))
+
+
+def _dialogue_text(ass):
+    return [line.split(",", 9)[9] for line in ass.splitlines() if line.startswith("Dialogue:")]
+
+
+def test_literal_angle_brackets_are_kept():
+    srt = (
+        "1\n00:00:00,000 --> 00:00:02,000\nSpeaker A: I <3 you\n\n"
+        "2\n00:00:02,000 --> 00:00:04,000\nSpeaker B: 3 < 5 and <b>bold</b>\n"
+    )
+    styled = style_srt_content(srt, ["white", "yellow"])
+    ass = render_ass_subtitles(styled, "input.mp4", StyleConfig(), AnimationConfig())
+
+    assert "I <3 you" in ass
+    assert "3 < 5 and bold" in ass
+
+
+def test_empty_srt_has_no_dialogue():
+    ass = render_ass_subtitles("", "input.mp4", StyleConfig(), AnimationConfig())
+
+    assert "[Events]" in ass
+    assert _dialogue_text(ass) == []
+
+
+def test_tags_are_stripped_regardless_of_case():
+    srt = (
+        "1\n00:00:00,000 --> 00:00:02,000\n"
+        '<FONT COLOR="yellow"><I>Hello</I></FONT> <s>old</s><br>new\n'
+    )
+    ass = render_ass_subtitles(srt, "input.mp4", PLAIN_STYLE, AnimationConfig(enabled=False))
+
+    (text,) = _dialogue_text(ass)
+    # The uppercase font tag still sets the color
+    assert text == f"{{\\c{color_to_ass('yellow')}}}Hello oldnew"
+
+
+def test_unquoted_font_color_is_used():
+    srt = "1\n00:00:00,000 --> 00:00:02,000\n<font color=yellow>Hi</font> a < b\n"
+    ass = render_ass_subtitles(srt, "input.mp4", PLAIN_STYLE, AnimationConfig(enabled=False))
+
+    (text,) = _dialogue_text(ass)
+    assert text == f"{{\\c{color_to_ass('yellow')}}}Hi a < b"